@@ -3,16 +3,19 @@ FastAPI Main Application for NAAC Compliance Intelligence System
 Provides REST API endpoints for the complete RAG pipeline and auto-update system
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, UploadFile, File, Form, APIRouter, Header
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, UploadFile, File, Form, APIRouter, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Any, Dict, List, Optional
 import logging
 import asyncio
+import importlib.util
 from datetime import datetime
 from pathlib import Path
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from threading import Lock
 from uuid import uuid4
@@ -20,6 +23,7 @@ from uuid import uuid4
 # Import our system components
 from ..rag.pipeline import RAGPipeline
 from ..rag.metadata_mapper import NAACMetadataMapper
+from ..rag.query_cache import QueryResponseCache
 try:
     from ..db.supabase_store import SupabaseVectorStore  # type: ignore[attr-defined]
     SUPABASE_IMPORT_ERROR = None
@@ -37,6 +41,8 @@ except Exception as import_exc:  # pragma: no cover - optional dependency
 from ..db.local_store import LocalVectorStore
 from ..llm.groq_client import GroqClient
 from ..memory.memory_store import ConversationMemoryStore, MemoryIdentity
+from ..db.pg_pool import close_all_pools
+from ..ingestion.pdf_loader import shutdown_page_block_pool
 from ..ingestion.ingest import DocumentIngestionPipeline
 from ..updater.auto_ingest import NAACAutoIngest
 from ..scheduler.update_scheduler import NAACUpdateScheduler
@@ -54,21 +60,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global system components (initialized on startup)
-rag_pipeline: Optional[RAGPipeline] = None
-auto_ingest: Optional[NAACAutoIngest] = None
-scheduler: Optional[NAACUpdateScheduler] = None
-metadata_mapper: Optional[NAACMetadataMapper] = None
-vector_store_instance: Optional[Any] = None
-memory_store_instance: Optional[ConversationMemoryStore] = None
-ingestion_pipeline_instance: Optional[DocumentIngestionPipeline] = None
-state_store_instance: Optional[Any] = None
 ingestion_status_store: Dict[str, Dict[str, Any]] = {}
 ingestion_status_lock = Lock()
 ACTIVE_INGEST_STATUSES = {"queued", "processing"}
 staged_upload_store: Dict[str, Dict[str, Any]] = {}
 staged_upload_lock = Lock()
 STAGED_UPLOAD_PREFIX = "memory://upload/"
+UPLOAD_READ_CHUNK_BYTES = 1 << 20
+
+# libuv-backed event loop when installed (uvloop does not support Windows)
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
 
 
 def _resolve_project_root() -> Path:
@@ -85,7 +86,7 @@ PROJECT_ROOT = _resolve_project_root()
 
 # Pydantic models for request/response
 class QueryRequest(BaseModel):
-    query: str = Field(..., description="Natural language query about NAAC compliance")
+    query: str = Field(..., min_length=1, description="Natural language query about NAAC compliance")
     filters: Optional[Dict[str, Any]] = Field(None, description="Optional filters for retrieval")
     include_sources: bool = Field(True, description="Include source details in response")
     tenant_id: Optional[str] = Field(None, description="Tenant scope for memory")
@@ -93,6 +94,8 @@ class QueryRequest(BaseModel):
     conversation_id: Optional[str] = Field(None, description="Conversation scope for memory")
 
 class ComplianceResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     naac_requirement: str = Field(..., description="Relevant NAAC requirements")
     mvsr_evidence: str = Field(..., description="MVSR supporting evidence")
     naac_mapping: str = Field(..., description="NAAC criterion mapping")
@@ -162,7 +165,14 @@ async def lifespan(app: FastAPI):
     logger.info("Starting NAAC Compliance Intelligence System")
     
     try:
-        await initialize_system()
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=settings.api_worker_threads or min(32, (os.cpu_count() or 1) * 2),
+                thread_name_prefix="api-worker",
+            )
+        )
+        await initialize_system(app)
+        start_ingest_workers(app)
         logger.info("System initialized successfully")
         yield
     except Exception as e:
@@ -171,16 +181,34 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("Shutting down NAAC Compliance Intelligence System")
-        await shutdown_system()
+        await shutdown_system(app)
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.app_name,
     description="A Retrieval-Augmented Generation platform for NAAC compliance analysis",
     version=settings.app_version,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# System components live on app.state; lifespan fills them in before traffic is served.
+# Auto-ingest, scheduler, memory, serverless state and the query cache stay None when disabled.
+for _component in (
+    "rag_pipeline",
+    "auto_ingest",
+    "scheduler",
+    "metadata_mapper",
+    "vector_store",
+    "memory_store",
+    "ingestion_pipeline",
+    "state_store",
+    "query_cache",
+    "ingest_queue",
+):
+    setattr(app.state, _component, None)
+app.state.ingest_worker_tasks = []
+
 # Create API router with /api prefix
 api_router = APIRouter(prefix="/api")
 
@@ -193,10 +221,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-async def initialize_system():
+async def initialize_system(app: FastAPI):
     """Initialize all system components"""
-    global rag_pipeline, auto_ingest, scheduler, metadata_mapper, vector_store_instance, memory_store_instance, ingestion_pipeline_instance, state_store_instance
-    
     try:
         # Initialize configured vector store with local fallback
         vector_backend = (settings.vector_backend or "supabase").lower()
@@ -224,6 +250,9 @@ async def initialize_system():
                 embedding_device=settings.embedding_device,
                 embedding_batch_size=settings.embedding_batch_size,
                 insert_batch_size=settings.vector_insert_batch_size,
+                embedding_cache_path=settings.embedding_cache_path,
+                pool_max_connections=settings.db_pool_max_connections,
+                query_embed_batch_size=settings.query_embed_batch_size,
             )
             consolidate = getattr(vector_store, "consolidate_single_row_mode", None)
             if callable(consolidate):
@@ -234,6 +263,9 @@ async def initialize_system():
                 embedding_model=settings.embedding_model,
                 embedding_device=settings.embedding_device,
                 embedding_batch_size=settings.embedding_batch_size,
+                embedding_cache_path=settings.embedding_cache_path,
+                query_embed_batch_size=settings.query_embed_batch_size,
+                quantize_embeddings=settings.local_store_quantize_int8,
             )
         vector_store_instance = vector_store
 
@@ -249,6 +281,7 @@ async def initialize_system():
                     db_url=settings.supabase_db_url,
                     staged_upload_ttl_minutes=settings.staged_upload_ttl_minutes,
                     ingestion_status_ttl_hours=settings.ingestion_status_ttl_hours,
+                    pool_max_connections=settings.db_pool_max_connections,
                 )
                 serverless_state_store.initialize_schema()
                 serverless_state_store.cleanup_expired()
@@ -267,6 +300,7 @@ async def initialize_system():
                 long_ttl_days=settings.memory_long_ttl_days,
                 short_limit=settings.memory_short_limit,
                 long_top_k=settings.memory_long_top_k,
+                pool_max_connections=settings.db_pool_max_connections,
             )
             memory_store.initialize_schema()
             memory_store.clear_short_term_memory()
@@ -294,6 +328,8 @@ async def initialize_system():
             pdf_extraction_strategy=settings.pdf_extraction_strategy,
             pdf_extract_tables=settings.pdf_extract_tables,
             persist_ingestion_log=settings.persist_ingestion_log,
+            write_batch_size=settings.ingest_write_batch_size,
+            max_workers=settings.ingest_max_workers or None,
         )
         ingestion_pipeline_instance = ingestion_pipeline
         
@@ -315,6 +351,18 @@ async def initialize_system():
                 "reranker_device": settings.reranker_device,
             },
         )
+
+        if settings.query_cache_enabled:
+            query_cache = QueryResponseCache(
+                embed_query=getattr(vector_store, "embed_query", None),
+                max_entries=settings.query_cache_max_entries,
+                ttl_seconds=settings.query_cache_ttl_seconds,
+                similarity_threshold=settings.query_cache_similarity_threshold,
+            )
+            # Uploads, auto-ingest and scheduled runs all write through the pipeline
+            ingestion_pipeline.add_write_listener(query_cache.clear)
+        else:
+            query_cache = None
         
         if settings.auto_ingest_enabled and not settings.is_serverless_runtime():
             auto_ingest = NAACAutoIngest(
@@ -337,6 +385,16 @@ async def initialize_system():
 
         # Initialize metadata mapper
         metadata_mapper = NAACMetadataMapper()
+
+        app.state.vector_store = vector_store_instance
+        app.state.state_store = state_store_instance
+        app.state.memory_store = memory_store_instance
+        app.state.ingestion_pipeline = ingestion_pipeline_instance
+        app.state.rag_pipeline = rag_pipeline
+        app.state.query_cache = query_cache
+        app.state.auto_ingest = auto_ingest
+        app.state.scheduler = scheduler
+        app.state.metadata_mapper = metadata_mapper
         
         logger.info("All system components initialized")
         
@@ -344,56 +402,79 @@ async def initialize_system():
         logger.error(f"System initialization failed: {e}")
         raise
 
-async def shutdown_system():
+def start_ingest_workers(app: FastAPI):
+    """Start the bounded ingestion queue and its worker tasks"""
+    ingest_queue = asyncio.Queue(maxsize=max(settings.ingest_queue_maxsize, 1))
+    app.state.ingest_queue = ingest_queue
+    for worker_index in range(max(settings.ingest_queue_workers, 1)):
+        app.state.ingest_worker_tasks.append(
+            asyncio.create_task(_ingest_worker(ingest_queue), name=f"ingest-worker-{worker_index}")
+        )
+
+
+async def _ingest_worker(queue: asyncio.Queue):
+    """Run queued ingestion jobs one at a time off the event loop"""
+    while True:
+        job = await queue.get()
+        try:
+            await asyncio.to_thread(job)
+        except Exception as e:
+            logger.error(f"Queued ingestion job failed: {e}", exc_info=True)
+        finally:
+            queue.task_done()
+
+
+async def shutdown_system(app: FastAPI):
     """Shutdown system components"""
-    global scheduler
-    
-    if scheduler:
-        scheduler.stop()
+    worker_tasks = app.state.ingest_worker_tasks
+    for task in worker_tasks:
+        task.cancel()
+    await asyncio.gather(*worker_tasks, return_exceptions=True)
+    worker_tasks.clear()
+
+    if app.state.scheduler:
+        app.state.scheduler.stop()
+
+    close_all_pools()
+    shutdown_page_block_pool()
 
 # Dependency functions
-def get_rag_pipeline() -> RAGPipeline:
+def get_rag_pipeline(request: Request) -> RAGPipeline:
     """Dependency to get RAG pipeline"""
-    if rag_pipeline is None:
-        raise HTTPException(status_code=503, detail="RAG pipeline not initialized")
-    return rag_pipeline
+    return request.app.state.rag_pipeline
 
-def get_auto_ingest() -> NAACAutoIngest:
+def get_auto_ingest(request: Request) -> NAACAutoIngest:
     """Dependency to get auto-ingest system"""
+    auto_ingest = request.app.state.auto_ingest
     if auto_ingest is None:
         raise HTTPException(status_code=503, detail="Auto-ingest system not initialized")
     return auto_ingest
 
-def get_scheduler() -> NAACUpdateScheduler:
+def get_scheduler(request: Request) -> NAACUpdateScheduler:
     """Dependency to get scheduler"""
+    scheduler = request.app.state.scheduler
     if scheduler is None:
         raise HTTPException(status_code=503, detail="Scheduler not initialized")
     return scheduler
 
-def get_metadata_mapper() -> NAACMetadataMapper:
+def get_metadata_mapper(request: Request) -> NAACMetadataMapper:
     """Dependency to get metadata mapper"""
-    if metadata_mapper is None:
-        raise HTTPException(status_code=503, detail="Metadata mapper not initialized")
-    return metadata_mapper
+    return request.app.state.metadata_mapper
 
 
-def get_vector_store() -> Any:
+def get_vector_store(request: Request) -> Any:
     """Dependency to get vector store"""
-    if vector_store_instance is None:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
-    return vector_store_instance
+    return request.app.state.vector_store
 
 
-def get_memory_store() -> Optional[ConversationMemoryStore]:
+def get_memory_store(request: Request) -> Optional[ConversationMemoryStore]:
     """Dependency to get memory store (optional)."""
-    return memory_store_instance
+    return request.app.state.memory_store
 
 
-def get_ingestion_pipeline() -> DocumentIngestionPipeline:
+def get_ingestion_pipeline(request: Request) -> DocumentIngestionPipeline:
     """Dependency to get the document ingestion pipeline."""
-    if ingestion_pipeline_instance is None:
-        raise HTTPException(status_code=503, detail="Document ingestion pipeline not initialized")
-    return ingestion_pipeline_instance
+    return request.app.state.ingestion_pipeline
 
 
 def _is_serverless_runtime() -> bool:
@@ -433,6 +514,19 @@ def _create_staged_upload_token(filename: str) -> str:
     return f"{STAGED_UPLOAD_PREFIX}{uuid4().hex}/{safe_name}"
 
 
+async def _read_upload_bounded(file: UploadFile, max_bytes: int) -> bytes:
+    """Read an upload in fixed-size chunks, rejecting it as soon as it exceeds max_bytes."""
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_READ_CHUNK_BYTES):
+        if len(buffer) + len(chunk) > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Uploaded PDF exceeds the {max_bytes // (1 << 20)} MB limit",
+            )
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
 def _set_staged_upload(
     token: str,
     *,
@@ -442,9 +536,10 @@ def _set_staged_upload(
 ) -> Dict[str, Any]:
     safe_filename = Path(filename or "uploaded.pdf").name
 
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            persisted = state_store_instance.set_staged_upload(
+            persisted = state_store.set_staged_upload(
                 token,
                 content=content,
                 filename=safe_filename,
@@ -475,9 +570,10 @@ def _set_staged_upload(
 
 
 def _get_staged_upload(token: str) -> Optional[Dict[str, Any]]:
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            record = state_store_instance.get_staged_upload(token)
+            record = state_store.get_staged_upload(token)
             if record is not None:
                 return record
         except Exception as store_error:
@@ -493,9 +589,10 @@ def _get_staged_upload(token: str) -> Optional[Dict[str, Any]]:
 
 
 def _remove_staged_upload(token: str) -> Optional[Dict[str, Any]]:
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            removed = state_store_instance.remove_staged_upload(token)
+            removed = state_store.remove_staged_upload(token)
             if removed is not None:
                 with staged_upload_lock:
                     staged_upload_store.pop(token, None)
@@ -536,9 +633,10 @@ def _set_ingestion_status(
     now = datetime.now().isoformat()
 
     current: Dict[str, Any] = {}
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            current = state_store_instance.get_ingestion_statuses([normalized_path]).get(normalized_path, {})
+            current = state_store.get_ingestion_statuses([normalized_path]).get(normalized_path, {})
         except Exception as store_error:
             logger.warning(
                 "Persistent ingestion status read failed for %s, falling back to in-memory store: %s",
@@ -566,9 +664,10 @@ def _set_ingestion_status(
     if status in {"completed", "failed"}:
         updated["completed_at"] = now
 
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            persisted = state_store_instance.set_ingestion_status(normalized_path, updated)
+            persisted = state_store.set_ingestion_status(normalized_path, updated)
             with ingestion_status_lock:
                 ingestion_status_store[normalized_path] = persisted.copy()
             return persisted.copy()
@@ -587,9 +686,10 @@ def _set_ingestion_status(
 def _remove_ingestion_status(file_path: str) -> None:
     normalized_path = _normalize_ingestion_path(file_path)
 
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            state_store_instance.remove_ingestion_status(normalized_path)
+            state_store.remove_ingestion_status(normalized_path)
         except Exception as store_error:
             logger.warning("Persistent ingestion status delete failed for %s: %s", normalized_path, store_error)
 
@@ -601,9 +701,10 @@ def _get_ingestion_statuses(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
     normalized_paths = [_normalize_ingestion_path(path) for path in file_paths]
 
     persisted_rows: Dict[str, Dict[str, Any]] = {}
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            persisted_rows = state_store_instance.get_ingestion_statuses(normalized_paths)
+            persisted_rows = state_store.get_ingestion_statuses(normalized_paths)
         except Exception as store_error:
             logger.warning("Persistent ingestion status batch read failed: %s", store_error)
 
@@ -627,9 +728,10 @@ def _get_ingestion_statuses(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
 
 
 def _has_active_manual_ingestion() -> bool:
-    if state_store_instance is not None:
+    state_store = app.state.state_store
+    if state_store is not None:
         try:
-            if state_store_instance.has_active_ingestion(list(ACTIVE_INGEST_STATUSES)):
+            if state_store.has_active_ingestion(list(ACTIVE_INGEST_STATUSES)):
                 return True
         except Exception as store_error:
             logger.warning("Persistent active-ingestion check failed, falling back to in-memory: %s", store_error)
@@ -640,35 +742,76 @@ def _has_active_manual_ingestion() -> bool:
             for status_row in ingestion_status_store.values()
         )
 
+_timestamp_cache: Dict[str, Any] = {"t": 0, "s": ""}
+
+
+def _now_iso() -> str:
+    """Second-resolution local timestamp for response payloads, formatted once per second."""
+    now = int(time.time())
+    if now != _timestamp_cache["t"]:
+        _timestamp_cache["s"] = datetime.fromtimestamp(now).isoformat()
+        _timestamp_cache["t"] = now
+    return _timestamp_cache["s"]
+
+
+_health_cache: Dict[str, Any] = {"ts": 0.0, "value": None}
+_health_cache_lock = asyncio.Lock()
+
+
+def _probe_component_health() -> Dict[str, Any]:
+    rag_pipeline = app.state.rag_pipeline
+    memory_store = app.state.memory_store
+    return {
+        "pipeline_health": rag_pipeline.get_pipeline_health() if rag_pipeline else None,
+        "memory_health": memory_store.get_health() if memory_store else None,
+    }
+
+
+async def _cached_component_health() -> Dict[str, Any]:
+    """Return component probes, refreshing at most once per TTL across concurrent callers."""
+    ttl = settings.health_cache_ttl_seconds
+    if _health_cache["value"] is not None and time.monotonic() - _health_cache["ts"] < ttl:
+        return _health_cache["value"]
+
+    async with _health_cache_lock:
+        if _health_cache["value"] is None or time.monotonic() - _health_cache["ts"] >= ttl:
+            _health_cache["value"] = await asyncio.to_thread(_probe_component_health)
+            _health_cache["ts"] = time.monotonic()
+        return _health_cache["value"]
+
+
 # API Endpoints
 
 @api_router.get("/health")
 async def health_check():
     """System health check"""
     try:
+        state = app.state
         health_status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "healthy",
             "components": {
-                "rag_pipeline": rag_pipeline is not None,
-                "auto_ingest": auto_ingest is not None,
-                "scheduler": scheduler is not None and scheduler.scheduler.running if scheduler else False,
-                "metadata_mapper": metadata_mapper is not None,
-                "memory_layer": memory_store_instance is not None,
-                "serverless_state": state_store_instance is not None,
+                "rag_pipeline": state.rag_pipeline is not None,
+                "auto_ingest": state.auto_ingest is not None,
+                "scheduler": state.scheduler.scheduler.running if state.scheduler else False,
+                "metadata_mapper": state.metadata_mapper is not None,
+                "memory_layer": state.memory_store is not None,
+                "serverless_state": state.state_store is not None,
             }
         }
         
+        component_health = await _cached_component_health()
+
         # Check RAG pipeline health if available
-        if rag_pipeline:
-            pipeline_health = rag_pipeline.get_pipeline_health()
+        pipeline_health = component_health["pipeline_health"]
+        if pipeline_health is not None:
             health_status["pipeline_health"] = pipeline_health
             
             if pipeline_health.get("overall_status") != "healthy":
                 health_status["status"] = "degraded"
 
-        if memory_store_instance:
-            memory_health = memory_store_instance.get_health()
+        memory_health = component_health["memory_health"]
+        if memory_health is not None:
             health_status["memory_health"] = memory_health
             if not memory_health.get("ok", False):
                 health_status["status"] = "degraded"
@@ -677,10 +820,10 @@ async def health_check():
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "status": "unhealthy",
                 "error": str(e)
             }
@@ -698,7 +841,7 @@ async def query_compliance(
     Process natural language queries and return structured compliance analysis
     """
     try:
-        if _has_active_manual_ingestion():
+        if await asyncio.to_thread(_has_active_manual_ingestion):
             raise HTTPException(
                 status_code=409,
                 detail="Chunking in progress. Wait until both documents finish processing.",
@@ -710,26 +853,41 @@ async def query_compliance(
         memory_identity: Optional[MemoryIdentity] = None
         if memory_store:
             try:
-                memory_store.cleanup_expired()
+                await asyncio.to_thread(memory_store.cleanup_expired)
                 memory_identity = _build_memory_identity(request)
-                memory_context = memory_store.get_context(memory_identity, request.query)
+                memory_context = await asyncio.to_thread(
+                    memory_store.get_context, memory_identity, request.query
+                )
             except Exception as memory_err:
                 logger.warning(f"Memory fetch failed; continuing without memory context: {memory_err}")
                 memory_context = None
 
-        # Process query through RAG pipeline (run sync function in thread to avoid blocking)
-        import asyncio
-        response = await asyncio.to_thread(
-            pipeline.process_query,
-            request.query,
-            request.filters,
-            memory_context,
-        )
+        # Conversation memory changes the answer, so only memory-free queries are cached
+        query_cache: Optional[QueryResponseCache] = app.state.query_cache
+        use_query_cache = query_cache is not None and not any((memory_context or {}).values())
+        response: Optional[Dict[str, Any]] = None
+        query_embedding = None
+        if use_query_cache:
+            response, query_embedding = await asyncio.to_thread(
+                query_cache.get, request.query, request.filters
+            )
+
+        if response is None:
+            # Process query through RAG pipeline (run sync function in thread to avoid blocking)
+            response = await asyncio.to_thread(
+                pipeline.process_query,
+                request.query,
+                request.filters,
+                memory_context,
+            )
+            if use_query_cache:
+                query_cache.put(request.query, request.filters, response, query_embedding)
 
         if memory_store and memory_identity:
             try:
                 assistant_text = _build_assistant_memory_text(response)
-                memory_store.add_messages(
+                await asyncio.to_thread(
+                    memory_store.add_messages,
                     memory_identity,
                     [
                         {
@@ -933,18 +1091,21 @@ async def ingest_documents(
                 "document_type": request.document_type,
                 "file_paths": resolved_paths,
                 "results": results,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
             }
 
-        # Local/dev mode keeps background ingestion to preserve current responsiveness.
-        background_tasks.add_task(run_ingestion)
+        # Local/dev mode queues ingestion; put() waits while the bounded queue is full.
+        if app.state.ingest_queue is not None:
+            await app.state.ingest_queue.put(run_ingestion)
+        else:
+            background_tasks.add_task(run_ingestion)
 
         return {
             "status": "accepted",
             "message": f"Ingestion started for {len(request.file_paths)} documents",
             "document_type": request.document_type,
             "file_paths": resolved_paths,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
         }
         
     except Exception as e:
@@ -957,8 +1118,8 @@ async def get_ingest_status(request: IngestStatusRequest):
     """Return current ingestion state for staged file paths."""
     try:
         return {
-            "statuses": _get_ingestion_statuses(request.file_paths),
-            "timestamp": datetime.now().isoformat(),
+            "statuses": await asyncio.to_thread(_get_ingestion_statuses, request.file_paths),
+            "timestamp": _now_iso(),
         }
     except Exception as e:
         logger.error(f"Ingestion status request failed: {e}")
@@ -999,7 +1160,7 @@ async def force_system_update(
             "message": f"System update started ({request.update_type})",
             "update_type": request.update_type,
             "criteria": request.criteria,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
     except Exception as e:
@@ -1014,23 +1175,24 @@ async def get_last_sync():
     Returns details about the most recent update operation
     """
     try:
+        auto_ingest = app.state.auto_ingest
         if auto_ingest is None:
             return {
                 "last_successful_update": None,
                 "recent_operations": [],
                 "system_status": "disabled",
                 "component_statistics": {},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
-        status = auto_ingest.get_update_status()
+        status = await asyncio.to_thread(auto_ingest.get_update_status)
         
         return {
             "last_successful_update": status.get("last_successful_update"),
             "recent_operations": status.get("recent_operations", [])[-5:],  # Last 5 operations
             "system_status": status.get("system_status"),
             "component_statistics": status.get("component_statistics"),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
     except Exception as e:
@@ -1041,6 +1203,7 @@ async def get_last_sync():
 async def get_scheduler_status():
     """Get scheduler status and job information"""
     try:
+        scheduler = app.state.scheduler
         if scheduler is None:
             return {
                 "scheduler_status": {
@@ -1050,11 +1213,11 @@ async def get_scheduler_status():
                     "uptime_hours": 0.0,
                 },
                 "jobs": [],
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
             }
 
-        status = scheduler.get_scheduler_status()
-        jobs = scheduler.get_job_list()
+        status = await asyncio.to_thread(scheduler.get_scheduler_status)
+        jobs = await asyncio.to_thread(scheduler.get_job_list)
 
         # Calculate uptime hours
         uptime_hours = 0.0
@@ -1082,7 +1245,7 @@ async def get_scheduler_status():
                 'schedule': job.schedule,
                 'next_run_time': job.next_run,
                 'status': job_status,
-                'created_at': datetime.now().isoformat(),  # Placeholder
+                'created_at': _now_iso(),  # Placeholder
                 'last_run': job.last_run,
                 'run_count': 0  # Placeholder - not tracked currently
             })
@@ -1096,7 +1259,7 @@ async def get_scheduler_status():
                 "uptime_hours": round(uptime_hours, 2)
             },
             "jobs": transformed_jobs,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
 
     except Exception as e:
@@ -1116,7 +1279,9 @@ async def schedule_job(
             # Parse hour and minute from schedule string (e.g., "02:30")
             try:
                 hour, minute = map(int, request.schedule.split(":"))
-                success = scheduler_system.schedule_daily_update(hour=hour, minute=minute)
+                success = await asyncio.to_thread(
+                    scheduler_system.schedule_daily_update, hour=hour, minute=minute
+                )
             except ValueError:
                 raise HTTPException(status_code=400, detail="Daily schedule must be in HH:MM format")
         
@@ -1124,14 +1289,15 @@ async def schedule_job(
             # Parse interval hours from schedule string (e.g., "6")
             try:
                 hours = int(request.schedule)
-                success = scheduler_system.schedule_interval_update(hours=hours)
+                success = await asyncio.to_thread(scheduler_system.schedule_interval_update, hours=hours)
             except ValueError:
                 raise HTTPException(status_code=400, detail="Interval schedule must be number of hours")
         
         elif request.job_type == "criterion":
             if not request.criteria:
                 raise HTTPException(status_code=400, detail="Criteria required for criterion-specific jobs")
-            success = scheduler_system.schedule_criterion_specific_update(
+            success = await asyncio.to_thread(
+                scheduler_system.schedule_criterion_specific_update,
                 criteria=request.criteria,
                 cron_expression=request.schedule
             )
@@ -1145,7 +1311,7 @@ async def schedule_job(
                 "message": f"Job scheduled successfully",
                 "job_type": request.job_type,
                 "schedule": request.schedule,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to schedule job")
@@ -1160,7 +1326,7 @@ async def schedule_job(
 async def pause_job(job_id: str, scheduler_system: NAACUpdateScheduler = Depends(get_scheduler)):
     """Pause a scheduled job"""
     try:
-        success = scheduler_system.pause_job(job_id)
+        success = await asyncio.to_thread(scheduler_system.pause_job, job_id)
         
         if success:
             return {"status": "success", "message": f"Job {job_id} paused"}
@@ -1175,7 +1341,7 @@ async def pause_job(job_id: str, scheduler_system: NAACUpdateScheduler = Depends
 async def resume_job(job_id: str, scheduler_system: NAACUpdateScheduler = Depends(get_scheduler)):
     """Resume a paused job"""
     try:
-        success = scheduler_system.resume_job(job_id)
+        success = await asyncio.to_thread(scheduler_system.resume_job, job_id)
         
         if success:
             return {"status": "success", "message": f"Job {job_id} resumed"}
@@ -1190,7 +1356,7 @@ async def resume_job(job_id: str, scheduler_system: NAACUpdateScheduler = Depend
 async def remove_job(job_id: str, scheduler_system: NAACUpdateScheduler = Depends(get_scheduler)):
     """Remove a scheduled job"""
     try:
-        success = scheduler_system.remove_job(job_id)
+        success = await asyncio.to_thread(scheduler_system.remove_job, job_id)
         
         if success:
             return {"status": "success", "message": f"Job {job_id} removed"}
@@ -1212,12 +1378,12 @@ async def analyze_query_mapping(
     Helps understand how queries are interpreted by the system
     """
     try:
-        mapping_analysis = mapper.get_comprehensive_mapping(query)
+        mapping_analysis = await asyncio.to_thread(mapper.get_comprehensive_mapping, query)
         
         return {
             "query": query,
             "analysis": mapping_analysis,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
     except Exception as e:
@@ -1230,9 +1396,10 @@ async def get_system_statistics(
 ):
     """Get comprehensive system statistics"""
     try:
-        pipeline_stats = pipeline.get_pipeline_stats()
+        auto_ingest = app.state.auto_ingest
+        pipeline_stats = await asyncio.to_thread(pipeline.get_pipeline_stats)
         update_status = (
-            auto_ingest.get_update_status()
+            await asyncio.to_thread(auto_ingest.get_update_status)
             if auto_ingest is not None
             else {
                 "system_status": "disabled",
@@ -1244,7 +1411,7 @@ async def get_system_statistics(
         return {
             "pipeline_statistics": pipeline_stats,
             "update_status": update_status,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
     except Exception as e:
@@ -1256,9 +1423,9 @@ async def get_system_statistics(
 async def get_db_health(vector_store: Any = Depends(get_vector_store)):
     """Database health and connectivity diagnostics for Supabase."""
     try:
-        health = vector_store.health_check()
+        health = await asyncio.to_thread(vector_store.health_check)
         if not health.get("ok", False):
-            return JSONResponse(status_code=503, content=health)
+            return ORJSONResponse(status_code=503, content=health)
         return health
     except Exception as e:
         logger.error(f"DB health check failed: {e}")
@@ -1281,19 +1448,21 @@ async def upload_document(
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
         original_filename = Path(file.filename).name
-        content = await file.read()
+        content = await _read_upload_bounded(file, settings.max_upload_size_mb << 20)
         if not content:
             raise HTTPException(status_code=400, detail="Uploaded PDF is empty")
 
         staged_token = _create_staged_upload_token(original_filename)
-        staged_record = _set_staged_upload(
+        staged_record = await asyncio.to_thread(
+            _set_staged_upload,
             staged_token,
             content=content,
             filename=original_filename,
             document_type=document_type,
         )
 
-        _set_ingestion_status(
+        await asyncio.to_thread(
+            _set_ingestion_status,
             staged_token,
             "staged",
             phase="staged",
@@ -1310,7 +1479,7 @@ async def upload_document(
             stored_path=staged_token,
             document_type=document_type,
             file_size=staged_record["file_size"],
-            timestamp=datetime.now().isoformat(),
+            timestamp=_now_iso(),
         )
         
     except HTTPException:
@@ -1327,13 +1496,13 @@ async def delete_staged_upload(request: StagedUploadDeleteRequest):
         stored_path = _normalize_ingestion_path(request.stored_path)
 
         if _is_staged_upload_token(stored_path):
-            _remove_staged_upload(stored_path)
-            _remove_ingestion_status(stored_path)
+            await asyncio.to_thread(_remove_staged_upload, stored_path)
+            await asyncio.to_thread(_remove_ingestion_status, stored_path)
             return {
                 "status": "deleted",
                 "message": "Staged upload removed",
                 "stored_path": stored_path,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
             }
 
         legacy_upload_dir = (PROJECT_ROOT / "uploads").resolve()
@@ -1344,13 +1513,13 @@ async def delete_staged_upload(request: StagedUploadDeleteRequest):
         if local_path.exists():
             local_path.unlink()
 
-        _remove_ingestion_status(str(local_path))
+        await asyncio.to_thread(_remove_ingestion_status, str(local_path))
 
         return {
             "status": "deleted",
             "message": "Staged upload removed",
             "stored_path": str(local_path),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
         }
     except HTTPException:
         raise
@@ -1436,5 +1605,6 @@ if __name__ == "__main__":
         host=settings.host, 
         port=settings.port,
         reload=settings.reload,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        loop=UVICORN_LOOP,
     )
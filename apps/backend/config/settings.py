@@ -4,9 +4,10 @@ Handles environment variables and application settings
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, field_validator
 from typing import Optional, List
 
 SETTINGS_FILE = Path(__file__).resolve()
@@ -47,6 +48,8 @@ class Settings(BaseSettings):
     reload: bool = Field(False, env="RELOAD")
     serverless_mode: bool = Field(False, env="SERVERLESS_MODE")
     ingest_inline_on_serverless: bool = Field(True, env="INGEST_INLINE_ON_SERVERLESS")
+    api_worker_threads: int = Field(0, env="API_WORKER_THREADS")  # 0 = min(32, 2 x CPU)
+    health_cache_ttl_seconds: float = Field(5.0, env="HEALTH_CACHE_TTL_SECONDS")
     
     # Database settings
     chroma_db_path: str = Field("./chroma_db", env="CHROMA_DB_PATH")
@@ -54,6 +57,7 @@ class Settings(BaseSettings):
     vector_backend: str = Field("supabase", env="VECTOR_BACKEND")
     supabase_db_url: Optional[str] = Field(None, env="SUPABASE_DB_URL")
     supabase_table: str = Field("chunks", env="SUPABASE_TABLE")
+    db_pool_max_connections: int = Field(10, env="DB_POOL_MAX_CONNECTIONS")
     embedding_dim: int = Field(384, env="EMBEDDING_DIM")
     
     # Groq API settings
@@ -66,6 +70,9 @@ class Settings(BaseSettings):
     embedding_device: str = Field("cpu", env="EMBEDDING_DEVICE")  # cpu or cuda
     embedding_batch_size: int = Field(128, env="EMBEDDING_BATCH_SIZE")
     vector_insert_batch_size: int = Field(1000, env="VECTOR_INSERT_BATCH_SIZE")
+    embedding_cache_path: Optional[str] = Field(None, env="EMBEDDING_CACHE_PATH")  # SQLite file; unset disables
+    query_embed_batch_size: int = Field(32, env="QUERY_EMBED_BATCH_SIZE")
+    local_store_quantize_int8: bool = Field(False, env="LOCAL_STORE_QUANTIZE_INT8")
     
     # Document processing settings
     pdf_extraction_strategy: str = Field("auto", env="PDF_EXTRACTION_STRATEGY")
@@ -83,6 +90,10 @@ class Settings(BaseSettings):
     large_document_chunk_size: int = Field(1800, env="LARGE_DOCUMENT_CHUNK_SIZE")
     large_document_chunk_overlap: int = Field(120, env="LARGE_DOCUMENT_CHUNK_OVERLAP")
     min_chunk_length: int = Field(180, env="MIN_CHUNK_LENGTH")
+    ingest_write_batch_size: int = Field(256, env="INGEST_WRITE_BATCH_SIZE")
+    ingest_max_workers: int = Field(0, env="INGEST_MAX_WORKERS")  # 0 = CPU count
+    ingest_queue_maxsize: int = Field(8, env="INGEST_QUEUE_MAXSIZE")
+    ingest_queue_workers: int = Field(1, env="INGEST_QUEUE_WORKERS")
     
     # Retrieval parameters
     max_retrieval_results: int = Field(10, env="MAX_RETRIEVAL_RESULTS")
@@ -99,6 +110,12 @@ class Settings(BaseSettings):
     )
     reranker_device: str = Field("cpu", env="RERANKER_DEVICE")
 
+    # Query response cache (exact + semantic)
+    query_cache_enabled: bool = Field(True, env="QUERY_CACHE_ENABLED")
+    query_cache_max_entries: int = Field(512, env="QUERY_CACHE_MAX_ENTRIES")
+    query_cache_ttl_seconds: int = Field(900, env="QUERY_CACHE_TTL_SECONDS")
+    query_cache_similarity_threshold: float = Field(0.97, env="QUERY_CACHE_SIMILARITY_THRESHOLD")
+
     # CORS settings
     cors_origins: List[str] = Field(["*"], env="CORS_ORIGINS")
     cors_allow_credentials: bool = Field(True, env="CORS_ALLOW_CREDENTIALS")
@@ -114,6 +131,7 @@ class Settings(BaseSettings):
     # Serverless state persistence
     serverless_state_enabled: bool = Field(True, env="SERVERLESS_STATE_ENABLED")
     staged_upload_ttl_minutes: int = Field(45, env="STAGED_UPLOAD_TTL_MINUTES")
+    max_upload_size_mb: int = Field(50, env="MAX_UPLOAD_SIZE_MB")
     ingestion_status_ttl_hours: int = Field(24, env="INGESTION_STATUS_TTL_HOURS")
     
     # Security settings
@@ -130,16 +148,27 @@ class Settings(BaseSettings):
     memory_short_limit: int = Field(20, env="MEMORY_SHORT_LIMIT")
     memory_long_top_k: int = Field(6, env="MEMORY_LONG_TOP_K")
     
+    # Resolved directories, created on first request and reused afterwards
+    _chroma_path: Optional[Path] = PrivateAttr(None)
+
     class Config:
         env_file = tuple(str(path) for path in ENV_FILE_CANDIDATES)
         env_file_encoding = "utf-8"
         extra = "ignore"  # Allow extra fields in environment
+        frozen = True  # Built once by get_settings(); never reassigned at runtime
     
     def get_chroma_path(self) -> Path:
         """Get ChromaDB directory as Path object"""
-        path = Path(self.chroma_db_path)
-        path.mkdir(parents=True, exist_ok=True)
-        return path
+        if self._chroma_path is None:
+            path = Path(self.chroma_db_path)
+            try:
+                path.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                # Read-only filesystems (serverless) may still have the directory mounted.
+                if not path.is_dir():
+                    raise
+            self._chroma_path = path
+        return self._chroma_path
 
     def is_serverless_runtime(self) -> bool:
         """Detect serverless runtime (explicit flag or Vercel environment)."""
@@ -149,9 +178,6 @@ class Settings(BaseSettings):
         vercel_flag = str(os.getenv("VERCEL", "")).strip().lower()
         return vercel_flag in {"1", "true", "yes", "on"}
 
-# Global settings instance
-settings = Settings()
-
 # Environment-specific configurations
 class DevelopmentSettings(Settings):
     """Development environment settings"""
@@ -172,8 +198,14 @@ class ProductionSettings(Settings):
     class Config:
         extra = "ignore"
 
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
-    """Get settings based on environment"""
+    """
+    Get settings based on environment.
+
+    Built once per process; call ``get_settings.cache_clear()`` to re-read the
+    environment (e.g. in tests).
+    """
     env = os.getenv("ENVIRONMENT", "development").lower()
     
     if env == "production":
@@ -182,3 +214,17 @@ def get_settings() -> Settings:
         return DevelopmentSettings()
     else:
         return Settings()
+
+
+class _LazySettings:
+    """Module-level stand-in that builds the settings on first attribute access."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+# Global settings instance; resolves to the cached get_settings() result
+settings = _LazySettings()
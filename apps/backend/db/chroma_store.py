@@ -6,47 +6,132 @@ Handles separate collections for NAAC Requirements and MVSR Evidence
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
+import copy
 import json
+from collections import OrderedDict
+from functools import cached_property, lru_cache
+from threading import Lock
 from typing import List, Dict, Any, Optional
 import uuid
 from pathlib import Path
 import logging
 
+from .embedding_cache import encode_unique
+
 # Setup logging
 logger = logging.getLogger(__name__)
 logging.getLogger("chromadb.telemetry.product.posthog").setLevel(logging.CRITICAL)
 
+# Metadata keys each collection requires on insert
+NAAC_REQUIRED_METADATA = frozenset(("type", "criterion", "version"))
+MVSR_REQUIRED_METADATA = frozenset(("type", "document", "year"))
+
+# Documents fetched per page when archiving an old NAAC version
+VERSION_ARCHIVE_PAGE_SIZE = 500
+
+
+@lru_cache(maxsize=4)
+def _get_embedding_function(model_name: str, device: str):
+    """Load a sentence-transformer embedding function once per (model, device)."""
+    if device.startswith("cuda"):
+        try:
+            import torch
+        except ImportError:
+            torch = None
+        if torch is not None and not torch.cuda.is_available():
+            logger.warning("Embedding device %s requested but CUDA is unavailable; using cpu", device)
+            device = "cpu"
+    return embedding_functions.SentenceTransformerEmbeddingFunction(
+        model_name=model_name,
+        device=device,
+    )
+
 class ChromaVectorStore:
     """
     Manages two separate ChromaDB collections:
     1. naac_requirements - NAAC guidelines, criteria, indicators
     2. mvsr_evidence - MVSR institutional documents and evidence
+
+    The Chroma client, embedding model and collections load on first use, so
+    constructing (or importing) the store stays cheap.
     """
+
+    _instance_lock = Lock()
     
-    def __init__(self, persist_directory: str = "./chroma_db"):
-        """Initialize ChromaDB with persistent storage"""
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_device: str = "cpu",
+        embedding_batch_size: int = 128,
+        write_batch_size: Optional[int] = None,
+        query_cache_size: int = 512,
+    ):
+        """
+        Initialize ChromaDB with persistent storage
+
+        Args:
+            persist_directory: Directory for the persistent Chroma client
+            embedding_model: Sentence-transformer model used by both collections
+            embedding_device: Device for the embedding model (cpu or cuda)
+            embedding_batch_size: Documents per embedding forward pass (larger suits cuda)
+            write_batch_size: Most documents sent in one add() call; defaults to
+                embedding_batch_size so each call is one full embedding batch
+            query_cache_size: Recent query results kept per store (0 disables)
+        """
         self.persist_directory = Path(persist_directory)
+        self.embedding_model = embedding_model
+        self.embedding_device = embedding_device
+
+        self.write_batch_size = max(int(write_batch_size or embedding_batch_size or 1), 1)
+
+        # Recent query results; cleared whenever a collection changes
+        self.query_cache_size = max(int(query_cache_size or 0), 0)
+        self._query_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._query_cache_lock = Lock()
+
+        # Document counts, read on first stats call then maintained on write
+        self._collection_counts: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def get_instance(cls, persist_directory: Optional[str] = None) -> "ChromaVectorStore":
+        """Return the shared store for the configured directory, embedding model and device."""
+        from ..config.settings import get_settings
+
+        settings = get_settings()
+        with cls._instance_lock:
+            return get_chroma_store(
+                persist_directory or settings.chroma_db_path,
+                settings.embedding_model,
+                settings.embedding_device,
+            )
+
+    @cached_property
+    def client(self):
+        """Persistent ChromaDB client, opened on first use."""
         self.persist_directory.mkdir(exist_ok=True)
-        
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
+        client = chromadb.PersistentClient(
             path=str(self.persist_directory),
             settings=Settings(
                 anonymized_telemetry=False,
                 allow_reset=True
             )
         )
-        
-        # Initialize sentence transformer embedding function
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
-        
-        # Get or create collections
-        self.naac_collection = self._get_or_create_collection("naac_requirements")
-        self.mvsr_collection = self._get_or_create_collection("mvsr_evidence")
-        
-        logger.info("ChromaDB initialized with collections: naac_requirements, mvsr_evidence")
+        logger.info("ChromaDB client opened at %s", self.persist_directory)
+        return client
+
+    @cached_property
+    def embedding_function(self):
+        """Sentence transformer embedding function, shared across store instances."""
+        return _get_embedding_function(self.embedding_model, self.embedding_device)
+
+    @cached_property
+    def naac_collection(self):
+        return self._get_or_create_collection("naac_requirements")
+
+    @cached_property
+    def mvsr_collection(self):
+        return self._get_or_create_collection("mvsr_evidence")
 
     def health_check(self) -> Dict[str, Any]:
         """Return lightweight health diagnostics comparable to Supabase backend."""
@@ -66,17 +151,11 @@ class ChromaVectorStore:
     
     def _get_or_create_collection(self, name: str):
         """Get existing collection or create new one"""
-        try:
-            return self.client.get_collection(
-                name=name,
-                embedding_function=self.embedding_function
-            )
-        except:
-            return self.client.create_collection(
-                name=name,
-                embedding_function=self.embedding_function,
-                metadata={"hnsw:space": "cosine"}
-            )
+        return self.client.get_or_create_collection(
+            name=name,
+            embedding_function=self.embedding_function,
+            metadata={"hnsw:space": "cosine"}
+        )
     
     def add_naac_documents(self, documents: List[str], metadatas: List[Dict]):
         """
@@ -96,25 +175,16 @@ class ChromaVectorStore:
             logger.warning("Empty documents or metadata provided for NAAC collection")
             return
             
-        # Generate unique IDs
-        ids = [f"naac_{uuid.uuid4().hex[:8]}" for _ in documents]
-        
-        # Validate metadata structure
-        for metadata in metadatas:
-            if not all(key in metadata for key in ["type", "criterion", "version"]):
+        # Validate metadata and generate unique IDs (one random prefix per batch) in one pass
+        batch_prefix = uuid.uuid4().hex[:8]
+        ids = []
+        for i, metadata in enumerate(metadatas):
+            if not NAAC_REQUIRED_METADATA.issubset(metadata):
                 raise ValueError("NAAC metadata missing required fields: type, criterion, version")
             metadata["type"] = "requirement"  # Ensure type is set correctly
+            ids.append(f"naac_{batch_prefix}_{i}")
         
-        try:
-            self.naac_collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            logger.info(f"Added {len(documents)} documents to NAAC requirements collection")
-        except Exception as e:
-            logger.error(f"Error adding NAAC documents: {e}")
-            raise
+        self._write_documents("naac_requirements", documents, metadatas, ids)
     
     def add_mvsr_documents(self, documents: List[str], metadatas: List[Dict]):
         """
@@ -133,25 +203,61 @@ class ChromaVectorStore:
             logger.warning("Empty documents or metadata provided for MVSR collection")
             return
             
-        # Generate unique IDs
-        ids = [f"mvsr_{uuid.uuid4().hex[:8]}" for _ in documents]
-        
-        # Validate metadata structure
-        for metadata in metadatas:
-            if not all(key in metadata for key in ["type", "document", "year"]):
+        # Validate metadata and generate unique IDs (one random prefix per batch) in one pass
+        batch_prefix = uuid.uuid4().hex[:8]
+        ids = []
+        for i, metadata in enumerate(metadatas):
+            if not MVSR_REQUIRED_METADATA.issubset(metadata):
                 raise ValueError("MVSR metadata missing required fields: type, document, year")
             metadata["type"] = "evidence"  # Ensure type is set correctly
+            ids.append(f"mvsr_{batch_prefix}_{i}")
         
+        self._write_documents("mvsr_evidence", documents, metadatas, ids)
+
+    def _write_documents(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+    ):
+        """
+        Write validated documents in add() calls of at most write_batch_size.
+
+        Everything is written before returning, so callers may record the
+        ingestion as soon as add_* succeeds. If a slice fails, slices already
+        written by this call are deleted again and the error is raised, leaving
+        the caller free to retry the whole file.
+        """
+        collection = self.naac_collection if collection_name == "naac_requirements" else self.mvsr_collection
+        written = 0
         try:
-            self.mvsr_collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            logger.info(f"Added {len(documents)} documents to MVSR evidence collection")
+            # Rows that repeat a text (boilerplate shared by several files) reuse one embedding
+            embeddings = encode_unique(documents, self.embedding_function).tolist()
+            for start in range(0, len(documents), self.write_batch_size):
+                end = start + self.write_batch_size
+                collection.add(
+                    documents=documents[start:end],
+                    embeddings=embeddings[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end],
+                )
+                written = min(end, len(documents))
         except Exception as e:
-            logger.error(f"Error adding MVSR documents: {e}")
+            logger.error("Error adding documents to %s: %s", collection_name, e)
+            if written:
+                try:
+                    collection.delete(ids=ids[:written])
+                except Exception as cleanup_error:
+                    logger.error("Could not remove partial write from %s: %s", collection_name, cleanup_error)
+                    self._collection_counts = None
+                self.clear_query_cache()
             raise
+
+        if self._collection_counts is not None:
+            self._collection_counts[collection_name] += written
+        self.clear_query_cache()
+        logger.info("Added %s documents to %s collection", written, collection_name)
     
     def query_naac_requirements(self, 
                                query_text: str, 
@@ -168,25 +274,12 @@ class ChromaVectorStore:
         Returns:
             Dict containing documents, metadatas, distances
         """
-        where_clause = None
-        if criterion_filter:
-            where_clause = {"criterion": {"$eq": criterion_filter}}
+        where_clause = {"criterion": {"$eq": criterion_filter}} if criterion_filter else None
             
         try:
-            results = self.naac_collection.query(
-                query_texts=[query_text],
-                n_results=n_results,
-                where=where_clause
-            )
-            
-            logger.info(f"NAAC query returned {len(results['documents'][0])} results")
-            return {
-                "documents": results['documents'][0],
-                "metadatas": results['metadatas'][0],
-                "distances": results['distances'][0]
-            }
+            return self._query_collection("naac_requirements", query_text, n_results, where_clause)
         except Exception as e:
-            logger.error(f"Error querying NAAC requirements: {e}")
+            logger.error("Error querying NAAC requirements: %s", e)
             return {"documents": [], "metadatas": [], "distances": []}
     
     def query_mvsr_evidence(self, 
@@ -204,32 +297,61 @@ class ChromaVectorStore:
         Returns:
             Dict containing documents, metadatas, distances
         """
-        where_clause = None
-        if category_filter:
-            where_clause = {"category": {"$eq": category_filter}}
+        where_clause = {"category": {"$eq": category_filter}} if category_filter else None
             
         try:
-            results = self.mvsr_collection.query(
-                query_texts=[query_text],
-                n_results=n_results,
-                where=where_clause
-            )
-            
-            logger.info(f"MVSR query returned {len(results['documents'][0])} results")
-            return {
-                "documents": results['documents'][0],
-                "metadatas": results['metadatas'][0],
-                "distances": results['distances'][0]
-            }
+            return self._query_collection("mvsr_evidence", query_text, n_results, where_clause)
         except Exception as e:
-            logger.error(f"Error querying MVSR evidence: {e}")
+            logger.error("Error querying MVSR evidence: %s", e)
             return {"documents": [], "metadatas": [], "distances": []}
     
+    def _query_collection(
+        self,
+        collection_name: str,
+        query_text: str,
+        n_results: int,
+        where_clause: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Run a similarity query, serving repeats from the query cache."""
+        cache_key = (collection_name, query_text, n_results, json.dumps(where_clause, sort_keys=True))
+        with self._query_cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+
+        collection = self.naac_collection if collection_name == "naac_requirements" else self.mvsr_collection
+        results = collection.query(
+            query_texts=[query_text],
+            n_results=n_results,
+            where=where_clause
+        )
+        response = {
+            "documents": results['documents'][0],
+            "metadatas": results['metadatas'][0],
+            "distances": results['distances'][0]
+        }
+        logger.info("%s query returned %s results", collection_name, len(response['documents']))
+
+        if self.query_cache_size:
+            with self._query_cache_lock:
+                self._query_cache[cache_key] = copy.deepcopy(response)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return response
+
+    def clear_query_cache(self):
+        """Drop cached query results after the collections change."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+
     def get_collection_stats(self) -> Dict[str, int]:
         """Get statistics about both collections"""
         try:
-            naac_count = self.naac_collection.count()
-            mvsr_count = self.mvsr_collection.count()
+            if self._collection_counts is None:
+                self.refresh_stats()
+            naac_count = self._collection_counts["naac_requirements"]
+            mvsr_count = self._collection_counts["mvsr_evidence"]
             
             return {
                 "naac_requirements_count": naac_count,
@@ -237,9 +359,16 @@ class ChromaVectorStore:
                 "total_documents": naac_count + mvsr_count
             }
         except Exception as e:
-            logger.error(f"Error getting collection stats: {e}")
+            logger.error("Error getting collection stats: %s", e)
             return {"naac_requirements_count": 0, "mvsr_evidence_count": 0, "total_documents": 0}
     
+    def refresh_stats(self):
+        """Re-read collection counts, e.g. after writes made outside this store."""
+        self._collection_counts = {
+            "naac_requirements": self.naac_collection.count(),
+            "mvsr_evidence": self.mvsr_collection.count(),
+        }
+
     def reset_collections(self):
         """Reset both collections (use with caution)"""
         try:
@@ -249,36 +378,66 @@ class ChromaVectorStore:
             # Recreate collections
             self.naac_collection = self._get_or_create_collection("naac_requirements")
             self.mvsr_collection = self._get_or_create_collection("mvsr_evidence")
+            self._collection_counts = {"naac_requirements": 0, "mvsr_evidence": 0}
+            self.clear_query_cache()
             
             logger.info("Collections reset successfully")
         except Exception as e:
-            logger.error(f"Error resetting collections: {e}")
+            logger.error("Error resetting collections: %s", e)
             raise
     
     def update_naac_version(self, old_version: str, new_version: str):
         """Archive old NAAC version and prepare for new version ingestion"""
         try:
-            # Get all documents with old version
-            old_docs = self.naac_collection.get(
-                where={"version": old_version}
-            )
-            
-            if old_docs and old_docs['ids']:
+            # Page through documents with the old version, fetching metadata only
+            archived = 0
+            offset = 0
+            while True:
+                page = self.naac_collection.get(
+                    where={"version": old_version},
+                    include=["metadatas"],
+                    limit=VERSION_ARCHIVE_PAGE_SIZE,
+                    offset=offset,
+                )
+                if not page or not page['ids']:
+                    break
+
                 # Update metadata to mark as archived
                 updated_metadatas = []
-                for metadata in old_docs['metadatas']:
+                for metadata in page['metadatas']:
                     metadata['status'] = 'archived'
                     metadata['archived_version'] = old_version
                     updated_metadatas.append(metadata)
-                
-                # Update the documents
+
                 self.naac_collection.update(
-                    ids=old_docs['ids'],
+                    ids=page['ids'],
                     metadatas=updated_metadatas
                 )
-                
-                logger.info(f"Archived {len(old_docs['ids'])} documents from version {old_version}")
+                archived += len(page['ids'])
+                # The version filter still matches archived rows, so advance past them
+                offset += len(page['ids'])
+
+            if archived:
+                self.clear_query_cache()
+                logger.info("Archived %s documents from version %s", archived, old_version)
             
         except Exception as e:
-            logger.error(f"Error updating NAAC version: {e}")
-            raise
\ No newline at end of file
+            logger.error("Error updating NAAC version: %s", e)
+            raise
+
+def get_chroma_store(
+    persist_directory: str = "./chroma_db",
+    embedding_model: str = "all-MiniLM-L6-v2",
+    embedding_device: str = "cpu",
+) -> ChromaVectorStore:
+    """Return the process-wide store for a persist directory, building it on first use."""
+    return _get_chroma_store(str(Path(persist_directory).resolve()), embedding_model, embedding_device)
+
+
+@lru_cache(maxsize=None)
+def _get_chroma_store(persist_directory: str, embedding_model: str, embedding_device: str) -> ChromaVectorStore:
+    return ChromaVectorStore(
+        persist_directory=persist_directory,
+        embedding_model=embedding_model,
+        embedding_device=embedding_device,
+    )
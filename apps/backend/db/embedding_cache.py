@@ -0,0 +1,132 @@
+"""Persistent embedding cache keyed by SHA-256 of chunk content.
+
+Re-ingesting an unchanged document produces the same chunk texts, so their
+embeddings can be read back from SQLite instead of running the model again.
+Without the cache, encode_unique still embeds text repeated within one write
+(headers and cover pages shared by several files) only once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stay below SQLite's default host-parameter limit for IN (...) lookups.
+_LOOKUP_BATCH_SIZE = 500
+
+
+def encode_unique(
+    texts: Sequence[str],
+    encoder: Callable[[List[str]], np.ndarray],
+) -> np.ndarray:
+    """Encode each distinct text once and repeat its vector wherever the text recurs."""
+    positions: Dict[str, int] = {}
+    rows = [positions.setdefault(text, len(positions)) for text in texts]
+    if not positions:
+        return np.empty((0, 0), dtype=np.float32)
+    encoded = np.asarray(encoder(list(positions)), dtype=np.float32)
+    return encoded if len(positions) == len(rows) else encoded[rows]
+
+
+class EmbeddingCache:
+    """SQLite store of float32 embeddings scoped by model namespace."""
+
+    def __init__(self, db_path: str, namespace: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    content_hash TEXT NOT NULL,
+                    namespace TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    PRIMARY KEY (content_hash, namespace)
+                )
+                """
+            )
+            self._conn.commit()
+
+        logger.info("Embedding cache enabled at %s (namespace=%s)", self.db_path, namespace)
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        encoder: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """Return embeddings for texts, encoding only the ones not cached yet."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        hashes = [self.content_hash(text) for text in texts]
+        cached = self._lookup(hashes)
+
+        missing: Dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash not in cached and content_hash not in missing:
+                missing[content_hash] = text
+
+        if missing:
+            encoded = np.asarray(encoder(list(missing.values())), dtype=np.float32)
+            fresh = dict(zip(missing.keys(), encoded))
+            self._store(fresh)
+            cached.update(fresh)
+
+        logger.info(
+            "Embedding cache: %s hit(s), %s miss(es) for %s text(s)",
+            len(texts) - len(missing),
+            len(missing),
+            len(texts),
+        )
+        return np.stack([cached[content_hash] for content_hash in hashes])
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        unique_hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for start in range(0, len(unique_hashes), _LOOKUP_BATCH_SIZE):
+                batch = unique_hashes[start : start + _LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                rows = self._conn.execute(
+                    f"""
+                    SELECT content_hash, embedding
+                    FROM embedding_cache
+                    WHERE namespace = ? AND content_hash IN ({placeholders})
+                    """,
+                    [self.namespace, *batch],
+                ).fetchall()
+                for content_hash, blob in rows:
+                    found[content_hash] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def _store(self, embeddings: Dict[str, np.ndarray]) -> None:
+        rows = [
+            (content_hash, self.namespace, np.asarray(vector, dtype=np.float32).tobytes())
+            for content_hash, vector in embeddings.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO embedding_cache (content_hash, namespace, embedding)
+                VALUES (?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.commit()
@@ -13,6 +13,9 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from .embedding_cache import EmbeddingCache, encode_unique
+from .query_embedder import QueryEmbeddingBatcher
+
 
 @dataclass
 class _VectorRecord:
@@ -21,6 +24,11 @@ class _VectorRecord:
     embedding: np.ndarray
 
 
+def _quantize_int8(embeddings: np.ndarray) -> np.ndarray:
+    """Store unit-length embeddings as int8 (4x smaller than float32)."""
+    return np.clip(np.rint(embeddings * 127.0), -127, 127).astype(np.int8)
+
+
 class LocalVectorStore:
     """Minimal vector backend that lives entirely in memory."""
 
@@ -29,9 +37,20 @@ class LocalVectorStore:
         embedding_model: str = "all-MiniLM-L6-v2",
         embedding_device: str = "cpu",
         embedding_batch_size: int = 128,
+        embedding_cache_path: Optional[str] = None,
+        query_embed_batch_size: int = 32,
+        quantize_embeddings: bool = False,
     ) -> None:
         self.embedding_batch_size = max(int(embedding_batch_size or 128), 8)
         self.embedder = SentenceTransformer(embedding_model, device=embedding_device)
+        self.embedding_cache = (
+            EmbeddingCache(embedding_cache_path, namespace=f"{embedding_model}:normalized")
+            if embedding_cache_path
+            else None
+        )
+        self.query_embedder = QueryEmbeddingBatcher(self._encode, max_batch_size=query_embed_batch_size)
+        # Normalized embeddings fit int8 at scale 127; cosine scoring is scale-free
+        self.quantize_embeddings = bool(quantize_embeddings)
         self.naac_records: List[_VectorRecord] = []
         self.mvsr_records: List[_VectorRecord] = []
 
@@ -100,7 +119,12 @@ class LocalVectorStore:
         if len(documents) != len(metadatas):
             raise ValueError("Documents and metadata must have the same length")
 
-        embeddings = self._encode(list(documents))
+        if self.embedding_cache is not None:
+            embeddings = self.embedding_cache.encode(list(documents), self._encode)
+        else:
+            embeddings = encode_unique(list(documents), self._encode)
+        if self.quantize_embeddings:
+            embeddings = _quantize_int8(np.asarray(embeddings))
         for doc, metadata, embedding in zip(documents, metadatas, embeddings, strict=False):
             clean_meta = dict(metadata or {})
             clean_meta.setdefault("type", doc_type)
@@ -126,7 +150,7 @@ class LocalVectorStore:
         if not candidates:
             candidates = store
 
-        query_embedding = self._encode([query_text])[0]
+        query_embedding = self.embed_query(query_text)
         doc_matrix = np.stack([record.embedding for record in candidates])
         similarities = doc_matrix @ query_embedding / (
             np.linalg.norm(doc_matrix, axis=1) * np.linalg.norm(query_embedding) + 1e-10
@@ -139,6 +163,9 @@ class LocalVectorStore:
 
         return {"documents": documents, "metadatas": metadatas, "distances": distances}
 
+    def embed_query(self, query_text: str) -> np.ndarray:
+        return self.query_embedder.embed(query_text)
+
     def _encode(self, texts: List[str]) -> np.ndarray:
         return np.asarray(
             self.embedder.encode(
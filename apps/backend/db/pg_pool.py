@@ -0,0 +1,122 @@
+"""Shared psycopg2 connection pools for the Postgres-backed stores."""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator
+
+import psycopg2
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 10
+# Supabase and pgbouncer drop idle sessions; connections idle this long are pinged before reuse
+IDLE_PING_SECONDS = 30.0
+
+_pools: Dict[str, ThreadedConnectionPool] = {}
+_pools_lock = Lock()
+# id(connection) -> time.monotonic() of its last return to the pool
+_last_used: Dict[int, float] = {}
+
+
+class _ConnectionPool(ThreadedConnectionPool):
+    """ThreadedConnectionPool that opens connections on demand and keeps up to maxconn idle."""
+
+    def __init__(self, maxconn: int, *args, **kwargs):
+        # psycopg2 opens minconn connections up front but only keeps a returned
+        # connection while fewer than minconn sit idle, so minconn is raised afterwards
+        super().__init__(0, maxconn, *args, **kwargs)
+        self.minconn = maxconn
+
+
+def _get_pool(connection_url: str, max_connections: int) -> ThreadedConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(connection_url)
+        if pool is None:
+            pool = _ConnectionPool(max(int(max_connections or 1), 1), connection_url)
+            _pools[connection_url] = pool
+        return pool
+
+
+def _is_alive(conn: "psycopg2.extensions.connection") -> bool:
+    if conn.closed:
+        return False
+    last_used = _last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < IDLE_PING_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+
+def _checkout(pool: ThreadedConnectionPool) -> "psycopg2.extensions.connection":
+    """Borrow a live connection, discarding any the server dropped while idle."""
+    while True:
+        conn = pool.getconn()
+        if _is_alive(conn):
+            return conn
+        logger.info("Discarding stale pooled Postgres connection")
+        _last_used.pop(id(conn), None)
+        pool.putconn(conn, close=True)
+
+
+@contextmanager
+def pooled_connection(
+    connection_url: str,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+) -> Iterator["psycopg2.extensions.connection"]:
+    """
+    Borrow a connection for one unit of work.
+
+    The transaction is committed on success and rolled back on error, matching
+    ``with psycopg2.connect(...) as conn``. The connection then goes back to the
+    pool instead of being left open, and up to max_connections of them stay
+    open for reuse. A connection that sat idle for IDLE_PING_SECONDS is pinged
+    first and replaced if the server dropped it. When every pooled connection
+    is busy, a one-off connection is opened and closed afterwards.
+    """
+    pool = _get_pool(connection_url, max_connections)
+    try:
+        conn = _checkout(pool)
+    except PoolError:
+        logger.debug("Postgres pool exhausted; opening a one-off connection")
+        conn = psycopg2.connect(connection_url)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+        return
+
+    discard = False
+    try:
+        with conn:
+            yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
+    finally:
+        discard = discard or bool(conn.closed)
+        if not discard:
+            _last_used[id(conn)] = time.monotonic()
+        pool.putconn(conn, close=discard)
+        if conn.closed:
+            # Closed here or by the pool after a lost session; its id may be reused
+            _last_used.pop(id(conn), None)
+
+
+def close_all_pools() -> None:
+    """Close every pooled connection, e.g. at application shutdown."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+        _last_used.clear()
@@ -0,0 +1,115 @@
+"""Coalescing query embedder shared by the vector stores.
+
+Every /query embeds the same text once for NAAC retrieval, once for MVSR
+retrieval and once for the response cache, and concurrent requests each pay
+for a single-row SentenceTransformer call. This embedder keeps a small memo of
+recent query vectors and funnels the remaining work through one background
+thread that encodes whatever queries are waiting as a single batch.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock, Thread
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingBatcher:
+    """Embed single queries, batching concurrent callers into one encode call."""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        memo_size: int = 256,
+    ):
+        """
+        Args:
+            encode: Embeds a list of texts and returns one row per text
+            max_batch_size: Most queries encoded together in one call
+            memo_size: Recent query embeddings kept for repeat lookups (0 disables)
+        """
+        self._encode = encode
+        self.max_batch_size = max(int(max_batch_size or 1), 1)
+        self.memo_size = max(int(memo_size or 0), 0)
+        self._memo: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._memo_lock = Lock()
+        self._pending: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[Thread] = None
+        self._worker_lock = Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        """Return the embedding for one query text (read-only array)."""
+        cached = self._memo_get(text)
+        if cached is not None:
+            return cached
+
+        self._ensure_worker()
+        future: Future = Future()
+        self._pending.put((text, future))
+        return future.result()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = Thread(target=self._run, name="query-embedder", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            # Take whatever arrived while the previous batch was encoding; never wait for more.
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = np.asarray(self._encode(texts))
+        except Exception as e:
+            logger.error(f"Query embedding failed for a batch of {len(texts)}: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        by_text = {}
+        for text, vector in zip(texts, vectors):
+            vector.setflags(write=False)
+            by_text[text] = vector
+            self._memo_put(text, vector)
+
+        if len(batch) > 1:
+            logger.debug("Embedded %s queued queries in one batch (%s unique)", len(batch), len(texts))
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+    def _memo_get(self, text: str) -> Optional[np.ndarray]:
+        if not self.memo_size:
+            return None
+        with self._memo_lock:
+            vector = self._memo.get(text)
+            if vector is not None:
+                self._memo.move_to_end(text)
+            return vector
+
+    def _memo_put(self, text: str, vector: np.ndarray) -> None:
+        if not self.memo_size:
+            return
+        with self._memo_lock:
+            self._memo[text] = vector
+            self._memo.move_to_end(text)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
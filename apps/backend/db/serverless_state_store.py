@@ -9,6 +9,8 @@ from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 import psycopg2
 from psycopg2.extras import Json
 
+from .pg_pool import DEFAULT_MAX_CONNECTIONS, pooled_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,11 +23,14 @@ class ServerlessStateStore:
         *,
         staged_upload_ttl_minutes: int = 45,
         ingestion_status_ttl_hours: int = 24,
+        pool_max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ):
         if not db_url:
             raise ValueError("SUPABASE_DB_URL is required for ServerlessStateStore")
 
         self.db_url = db_url
+        self.connection_url = self._build_connection_url(db_url)
+        self.pool_max_connections = pool_max_connections
         self.staged_upload_ttl_minutes = max(int(staged_upload_ttl_minutes or 45), 5)
         self.ingestion_status_ttl_hours = max(int(ingestion_status_ttl_hours or 24), 1)
 
@@ -272,8 +277,7 @@ class ServerlessStateStore:
         return bool(row and row[0])
 
     def _get_connection(self):
-        connection_url = self._build_connection_url(self.db_url)
-        return psycopg2.connect(connection_url)
+        return pooled_connection(self.connection_url, self.pool_max_connections)
 
     def _build_connection_url(self, db_url: str) -> str:
         """Ensure robust SSL/statement_timeout defaults for managed Postgres connections."""
@@ -9,10 +9,13 @@ import time
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from typing import Any, Dict, List, Optional, Tuple
 
-import psycopg2
 from psycopg2.extras import Json, execute_values
 from sentence_transformers import SentenceTransformer
 
+from .embedding_cache import EmbeddingCache, encode_unique
+from .pg_pool import DEFAULT_MAX_CONNECTIONS, pooled_connection
+from .query_embedder import QueryEmbeddingBatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,16 +31,29 @@ class SupabaseVectorStore:
         embedding_device: str = "cpu",
         embedding_batch_size: int = 128,
         insert_batch_size: int = 1000,
+        embedding_cache_path: Optional[str] = None,
+        pool_max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        query_embed_batch_size: int = 32,
     ):
         if not db_url:
             raise ValueError("SUPABASE_DB_URL is required for SupabaseVectorStore")
 
         self.db_url = db_url
+        self.connection_url = self._build_connection_url(db_url)
+        self.pool_max_connections = pool_max_connections
         self.table_name = table_name
         self.embedding_dim = embedding_dim
         self.embedding_batch_size = max(int(embedding_batch_size or 128), 8)
         self.insert_batch_size = max(int(insert_batch_size or 1000), 100)
         self.embedder = SentenceTransformer(embedding_model, device=embedding_device)
+        self.embedding_cache = (
+            EmbeddingCache(embedding_cache_path, namespace=embedding_model)
+            if embedding_cache_path
+            else None
+        )
+        self.query_embedder = QueryEmbeddingBatcher(
+            self._encode_queries, max_batch_size=query_embed_batch_size
+        )
 
         logger.info(
             "Supabase vector store initialized (table=%s, model=%s, dim=%s)",
@@ -195,12 +211,10 @@ class SupabaseVectorStore:
             return
 
         contents = [row[0] for row in rows_to_insert]
-        embeddings = self.embedder.encode(
-            contents,
-            normalize_embeddings=False,
-            batch_size=self.embedding_batch_size,
-            show_progress_bar=False,
-        )
+        if self.embedding_cache is not None:
+            embeddings = self.embedding_cache.encode(contents, self._encode_documents)
+        else:
+            embeddings = encode_unique(contents, self._encode_documents)
 
         with self._get_connection() as conn, conn.cursor() as cur:
             # Remove legacy single-row records for this doc type.
@@ -274,6 +288,20 @@ class SupabaseVectorStore:
             (time.time() - started) * 1000,
         )
 
+    def _encode_documents(self, contents: List[str]):
+        return self.embedder.encode(
+            contents,
+            normalize_embeddings=False,
+            batch_size=self.embedding_batch_size,
+            show_progress_bar=False,
+        )
+
+    def embed_query(self, query_text: str):
+        return self.query_embedder.embed(query_text)
+
+    def _encode_queries(self, queries: List[str]):
+        return self.embedder.encode(queries, normalize_embeddings=False, show_progress_bar=False)
+
     def _query(
         self,
         query_text: str,
@@ -291,7 +319,7 @@ class SupabaseVectorStore:
             category_filter,
         )
 
-        query_embedding = self.embedder.encode([query_text], normalize_embeddings=False)[0]
+        query_embedding = self.embed_query(query_text)
         emb_str = self._to_vector_literal(query_embedding)
 
         where_clauses = ["doc_type = %s"]
@@ -350,9 +378,7 @@ class SupabaseVectorStore:
         return {"documents": documents, "metadatas": metadatas, "distances": distances}
 
     def _get_connection(self):
-        logger.debug("Opening Supabase Postgres connection")
-        connection_url = self._build_connection_url(self.db_url)
-        return psycopg2.connect(connection_url)
+        return pooled_connection(self.connection_url, self.pool_max_connections)
 
     def _build_connection_url(self, db_url: str) -> str:
         """Ensure Supabase-safe connection settings exist in URL."""
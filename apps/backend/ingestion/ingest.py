@@ -5,15 +5,20 @@ Orchestrates PDF loading, chunking, and vector store ingestion
 
 import hashlib
 import json
+import os
 import re
 import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Protocol
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
 
 from ..debug.trace_logger import get_pipeline_trace_logger
 from .chunker import DocumentChunker, TextChunk
-from .pdf_loader import PDFLoader
+from .ingestion_log import IngestionLog
+from .pdf_loader import PDFLoader, calculate_file_hash, mark_extraction_worker
 
 
 class VectorStore(Protocol):
@@ -25,6 +30,139 @@ class VectorStore(Protocol):
 
 logger = logging.getLogger(__name__)
 
+# SQLite history of ingested files, kept when persist_ingestion_log is enabled
+INGESTION_LOG_DB = "ingestion_log.db"
+# Chunk text cleanup before embedding
+_PAGE_MARKER_RE = re.compile(r"---\s*Page\s+\d+\s*---")
+_TABLE_MARKER_RE = re.compile(r"---\s*Table\s+\d+\s+on\s+Page\s+\d+\s*---")
+_MARKER_LINE_RE = re.compile(r"^---\s*(?:Page|Table)\b", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+# NAAC criterion folders: "criterion_<n>" with the number taken up to the next underscore
+_CRITERION_DIR_RE = re.compile(r"criterion_([^_]*)")
+
+# Written next to the ingestion log when persist_ingestion_log is enabled
+DIRECTORY_SENTINEL_FILE = "ingestion_sentinels.json"
+# Files submitted per extraction worker ahead of the consumer during directory ingestion
+EXTRACTION_WINDOW_PER_WORKER = 2
+# Directory batches smaller than this are extracted in-process instead of forking workers
+INLINE_EXTRACTION_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _scan_pdf_entries(directory: Path) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    """Split a directory into (PDF files, subdirectories) with a single scandir pass."""
+    pdf_files: List[os.DirEntry] = []
+    subdirectories: List[os.DirEntry] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirectories.append(entry)
+            elif entry.name.endswith(".pdf") and not entry.name.startswith(".") and entry.is_file():
+                pdf_files.append(entry)
+    return pdf_files, subdirectories
+
+
+def _scan_pdf_tree(directory: Path) -> Tuple[List[os.DirEntry], List[Tuple[os.DirEntry, List[os.DirEntry]]]]:
+    """Scan a directory and each immediate subdirectory once: (root PDFs, [(subdirectory, its PDFs)])."""
+    root_pdfs, subdirectories = _scan_pdf_entries(directory)
+    return root_pdfs, [
+        (subdirectory, _scan_pdf_entries(Path(subdirectory.path))[0]) for subdirectory in subdirectories
+    ]
+
+
+def _chunk_with_fallback(
+    text: str,
+    base_metadata: Dict[str, Any],
+    chunker: DocumentChunker,
+    large_document_chunker: DocumentChunker,
+    large_document_page_threshold: int,
+) -> List[TextChunk]:
+    """Chunk text and fallback to one cleaned chunk when structural chunking yields none."""
+    total_pages = int(base_metadata.get("total_pages", 1) or 1)
+    selected = large_document_chunker if total_pages >= large_document_page_threshold else chunker
+    chunks = selected.chunk_document(text, base_metadata)
+    if chunks:
+        return chunks
+
+    cleaned_text = " ".join((text or "").split())
+    if not cleaned_text:
+        return []
+
+    return [
+        TextChunk(
+            text=cleaned_text,
+            chunk_index=0,
+            start_page=1,
+            end_page=total_pages,
+            chunk_type="content",
+            metadata=base_metadata.copy(),
+        )
+    ]
+
+
+def _extract_and_chunk(
+    file_path: str,
+    document_type: str,
+    metadata_overrides: Dict[str, Any],
+    pdf_loader: PDFLoader,
+    chunker: DocumentChunker,
+    large_document_chunker: DocumentChunker,
+    large_document_page_threshold: int,
+    file_hash: Optional[str] = None,
+) -> Tuple[Dict[str, Any], List[TextChunk]]:
+    """Load and chunk one PDF. Module-level so process pool workers can unpickle it."""
+    text, metadata = pdf_loader.load_pdf(file_path, document_type, file_hash=file_hash)
+    for key, value in metadata_overrides.items():
+        setattr(metadata, key, value)
+
+    metadata_dict = metadata.__dict__.copy()
+    chunks = _chunk_with_fallback(
+        text,
+        metadata_dict,
+        chunker,
+        large_document_chunker,
+        large_document_page_threshold,
+    )
+    return metadata_dict, chunks
+
+
+# Loader and chunkers of the current extraction worker process, set once by _init_extraction_worker
+_WORKER_COMPONENTS: Dict[str, Any] = {}
+
+
+def _init_extraction_worker(
+    pdf_loader: PDFLoader,
+    chunker: DocumentChunker,
+    large_document_chunker: DocumentChunker,
+    large_document_page_threshold: int,
+) -> None:
+    """Process pool initializer: receive the pipeline components once per worker instead of per file."""
+    mark_extraction_worker()
+    _WORKER_COMPONENTS.update(
+        pdf_loader=pdf_loader,
+        chunker=chunker,
+        large_document_chunker=large_document_chunker,
+        large_document_page_threshold=large_document_page_threshold,
+    )
+
+
+def _extract_and_chunk_in_worker(
+    file_path: str,
+    document_type: str,
+    metadata_overrides: Dict[str, Any],
+    file_hash: Optional[str],
+) -> Tuple[Dict[str, Any], List[TextChunk]]:
+    """Pool task: _extract_and_chunk with the components installed by _init_extraction_worker."""
+    return _extract_and_chunk(
+        file_path,
+        document_type,
+        metadata_overrides,
+        _WORKER_COMPONENTS["pdf_loader"],
+        _WORKER_COMPONENTS["chunker"],
+        _WORKER_COMPONENTS["large_document_chunker"],
+        _WORKER_COMPONENTS["large_document_page_threshold"],
+        file_hash,
+    )
+
 
 class DocumentIngestionPipeline:
     """
@@ -47,6 +185,8 @@ class DocumentIngestionPipeline:
         pdf_extraction_strategy: str = "auto",
         pdf_extract_tables: bool = False,
         persist_ingestion_log: bool = False,
+        write_batch_size: int = 256,
+        max_workers: Optional[int] = None,
     ):
         """
         Initialize ingestion pipeline
@@ -55,8 +195,14 @@ class DocumentIngestionPipeline:
             vector_store: Vector store instance (Supabase pgvector)
             chunk_size: Target size for text chunks
             chunk_overlap: Overlap between consecutive chunks
+            write_batch_size: Row count that triggers a bulk vector-store write
+                during directory ingestion
+            max_workers: Processes used to extract and chunk PDFs during directory
+                ingestion (defaults to the CPU count; 1 disables the pool)
         """
         self.vector_store = vector_store
+        self.write_batch_size = max(int(write_batch_size or 256), 1)
+        self.max_workers = max(int(max_workers or os.cpu_count() or 1), 1)
         self.large_document_page_threshold = max(int(large_document_page_threshold or 120), 1)
         self.min_chunk_length = max(int(min_chunk_length or 180), 50)
 
@@ -82,8 +228,19 @@ class DocumentIngestionPipeline:
         self.trace_logger = get_pipeline_trace_logger()
         self.persist_ingestion_log = bool(persist_ingestion_log)
 
+        # Duplicate checks and the ingestion log both hash each file; hash it once per version
+        self._hash_cache: Dict[Tuple[str, int, int], str] = {}
+
         # Track ingested documents to avoid duplicates
-        self.ingestion_log = self._load_ingestion_log()
+        self.ingestion_log = IngestionLog(INGESTION_LOG_DB if self.persist_ingestion_log else None)
+        self.directory_sentinels = self._load_directory_sentinels()
+
+        # Called after every vector-store write, e.g. to drop cached query responses
+        self._write_listeners: List[Callable[[], None]] = []
+
+    def add_write_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback run whenever ingested rows are written to the vector store."""
+        self._write_listeners.append(callback)
 
     def ingest_naac_documents(
         self,
@@ -108,98 +265,42 @@ class DocumentIngestionPipeline:
         if not directory.exists():
             raise FileNotFoundError(f"NAAC directory not found: {directory}")
 
-        document_results: List[Dict[str, Any]] = []
-        chunk_documents: List[str] = []
-        chunk_metadatas: List[Dict[str, Any]] = []
+        sentinel_key = f"naac_requirement:{version}:{directory.resolve()}"
+        # One scan feeds both the change fingerprint and the task list
+        root_pdfs, subdirectory_pdfs = _scan_pdf_tree(directory)
+        fingerprint = self._directory_fingerprint(root_pdfs, subdirectory_pdfs)
+        if not force_reingest and self._directory_unchanged(sentinel_key, fingerprint):
+            logger.info("NAAC directory unchanged since last ingestion; skipping %s", directory)
+            return self._unchanged_directory_result("naac_requirements", version=version)
+
+        tasks: List[Tuple[Path, Dict[str, Any]]] = []
 
         # Process criterion subdirectories
-        for criterion_dir in directory.iterdir():
-            if not (criterion_dir.is_dir() and criterion_dir.name.startswith("criterion_")):
+        for criterion_dir, criterion_pdfs in subdirectory_pdfs:
+            criterion_match = _CRITERION_DIR_RE.match(criterion_dir.name)
+            if criterion_match is None:
                 continue
 
-            criterion_num = criterion_dir.name.split("_")[1]
+            criterion_num = criterion_match.group(1)
             logger.info("Processing NAAC Criterion %s documents", criterion_num)
 
-            for pdf_file in criterion_dir.glob("*.pdf"):
-                try:
-                    if not force_reingest and self._is_document_ingested(pdf_file, "naac_requirement"):
-                        logger.info("Skipping already ingested file: %s", pdf_file.name)
-                        continue
-
-                    text, metadata = self.pdf_loader.load_pdf(str(pdf_file), "naac_requirement")
-                    metadata.criterion = criterion_num
-                    metadata.version = version
-
-                    chunks = self._chunk_with_fallback(text, metadata.__dict__.copy())
-                    if not chunks:
-                        raise ValueError("No text chunks generated")
-
-                    documents, metadatas = self._prepare_chunk_rows(chunks, metadata.__dict__.copy())
-                    chunk_documents.extend(documents)
-                    chunk_metadatas.extend(metadatas)
-
-                    self._log_ingestion(pdf_file, "naac_requirement", len(chunks))
-                    document_results.append(
-                        {
-                            "file": pdf_file.name,
-                            "criterion": criterion_num,
-                            "chunks": len(chunks),
-                            "status": "success",
-                        }
-                    )
-                except Exception as e:
-                    logger.error("Failed to ingest NAAC document %s: %s", pdf_file.name, e)
-                    document_results.append(
-                        {
-                            "file": pdf_file.name,
-                            "criterion": criterion_num,
-                            "chunks": 0,
-                            "status": "failed",
-                            "error": str(e),
-                        }
-                    )
-
-        # Process files directly in NAAC root directory
-        for pdf_file in directory.glob("*.pdf"):
-            try:
+            for entry in criterion_pdfs:
+                pdf_file = Path(entry.path)
                 if not force_reingest and self._is_document_ingested(pdf_file, "naac_requirement"):
+                    logger.info("Skipping already ingested file: %s", pdf_file.name)
                     continue
+                tasks.append((pdf_file, {"criterion": criterion_num, "version": version}))
 
-                text, metadata = self.pdf_loader.load_pdf(str(pdf_file), "naac_requirement")
-                metadata.version = version
-                chunks = self._chunk_with_fallback(text, metadata.__dict__.copy())
-                if not chunks:
-                    raise ValueError("No text chunks generated")
-
-                documents, metadatas = self._prepare_chunk_rows(chunks, metadata.__dict__.copy())
-                chunk_documents.extend(documents)
-                chunk_metadatas.extend(metadatas)
-
-                self._log_ingestion(pdf_file, "naac_requirement", len(chunks))
-                document_results.append(
-                    {
-                        "file": pdf_file.name,
-                        "criterion": metadata.criterion or "general",
-                        "chunks": len(chunks),
-                        "status": "success",
-                    }
-                )
-            except Exception as e:
-                logger.error("Failed to ingest NAAC document %s: %s", pdf_file.name, e)
-                document_results.append(
-                    {
-                        "file": pdf_file.name,
-                        "criterion": "unknown",
-                        "chunks": 0,
-                        "status": "failed",
-                        "error": str(e),
-                    }
-                )
+        # Process files directly in NAAC root directory
+        for entry in root_pdfs:
+            pdf_file = Path(entry.path)
+            if not force_reingest and self._is_document_ingested(pdf_file, "naac_requirement"):
+                continue
+            tasks.append((pdf_file, {"version": version}))
 
-        total_chunks_written = 0
-        if chunk_documents:
-            self.vector_store.add_naac_documents(chunk_documents, chunk_metadatas)
-            total_chunks_written = len(chunk_documents)
+        document_results, total_chunks_written = self._ingest_file_tasks(tasks, "naac_requirement")
+        if all(result["status"] == "success" for result in document_results):
+            self._record_directory_sentinel(sentinel_key, fingerprint)
 
         results = {
             "document_type": "naac_requirements",
@@ -239,97 +340,38 @@ class DocumentIngestionPipeline:
         if not directory.exists():
             raise FileNotFoundError(f"MVSR directory not found: {directory}")
 
-        document_results: List[Dict[str, Any]] = []
-        chunk_documents: List[str] = []
-        chunk_metadatas: List[Dict[str, Any]] = []
+        sentinel_key = f"mvsr_evidence:{directory.resolve()}"
+        # One scan feeds both the change fingerprint and the task list
+        root_pdfs, subdirectory_pdfs = _scan_pdf_tree(directory)
+        fingerprint = self._directory_fingerprint(root_pdfs, subdirectory_pdfs)
+        if not force_reingest and self._directory_unchanged(sentinel_key, fingerprint):
+            logger.info("MVSR directory unchanged since last ingestion; skipping %s", directory)
+            return self._unchanged_directory_result("mvsr_evidence")
 
-        # Process category subdirectories
-        for category_dir in directory.iterdir():
-            if not category_dir.is_dir():
-                continue
+        tasks: List[Tuple[Path, Dict[str, Any]]] = []
 
+        # Process category subdirectories
+        for category_dir, category_pdfs in subdirectory_pdfs:
             category = category_dir.name
             logger.info("Processing MVSR %s documents", category)
 
-            for pdf_file in category_dir.glob("*.pdf"):
-                try:
-                    if not force_reingest and self._is_document_ingested(pdf_file, "mvsr_evidence"):
-                        logger.info("Skipping already ingested file: %s", pdf_file.name)
-                        continue
-
-                    text, metadata = self.pdf_loader.load_pdf(str(pdf_file), "mvsr_evidence")
-                    metadata.category = category
-                    chunks = self._chunk_with_fallback(text, metadata.__dict__.copy())
-                    if not chunks:
-                        raise ValueError("No text chunks generated")
-
-                    documents, metadatas = self._prepare_chunk_rows(chunks, metadata.__dict__.copy())
-                    chunk_documents.extend(documents)
-                    chunk_metadatas.extend(metadatas)
-
-                    self._log_ingestion(pdf_file, "mvsr_evidence", len(chunks))
-                    document_results.append(
-                        {
-                            "file": pdf_file.name,
-                            "category": category,
-                            "mapped_criterion": metadata.criterion,
-                            "chunks": len(chunks),
-                            "status": "success",
-                        }
-                    )
-                except Exception as e:
-                    logger.error("Failed to ingest MVSR document %s: %s", pdf_file.name, e)
-                    document_results.append(
-                        {
-                            "file": pdf_file.name,
-                            "category": category,
-                            "chunks": 0,
-                            "status": "failed",
-                            "error": str(e),
-                        }
-                    )
-
-        # Process files directly in MVSR root directory
-        for pdf_file in directory.glob("*.pdf"):
-            try:
+            for entry in category_pdfs:
+                pdf_file = Path(entry.path)
                 if not force_reingest and self._is_document_ingested(pdf_file, "mvsr_evidence"):
+                    logger.info("Skipping already ingested file: %s", pdf_file.name)
                     continue
+                tasks.append((pdf_file, {"category": category}))
 
-                text, metadata = self.pdf_loader.load_pdf(str(pdf_file), "mvsr_evidence")
-                chunks = self._chunk_with_fallback(text, metadata.__dict__.copy())
-                if not chunks:
-                    raise ValueError("No text chunks generated")
-
-                documents, metadatas = self._prepare_chunk_rows(chunks, metadata.__dict__.copy())
-                chunk_documents.extend(documents)
-                chunk_metadatas.extend(metadatas)
-
-                self._log_ingestion(pdf_file, "mvsr_evidence", len(chunks))
-                document_results.append(
-                    {
-                        "file": pdf_file.name,
-                        "category": metadata.category or "general",
-                        "mapped_criterion": metadata.criterion,
-                        "chunks": len(chunks),
-                        "status": "success",
-                    }
-                )
-            except Exception as e:
-                logger.error("Failed to ingest MVSR document %s: %s", pdf_file.name, e)
-                document_results.append(
-                    {
-                        "file": pdf_file.name,
-                        "category": "unknown",
-                        "chunks": 0,
-                        "status": "failed",
-                        "error": str(e),
-                    }
-                )
+        # Process files directly in MVSR root directory
+        for entry in root_pdfs:
+            pdf_file = Path(entry.path)
+            if not force_reingest and self._is_document_ingested(pdf_file, "mvsr_evidence"):
+                continue
+            tasks.append((pdf_file, {}))
 
-        total_chunks_written = 0
-        if chunk_documents:
-            self.vector_store.add_mvsr_documents(chunk_documents, chunk_metadatas)
-            total_chunks_written = len(chunk_documents)
+        document_results, total_chunks_written = self._ingest_file_tasks(tasks, "mvsr_evidence")
+        if all(result["status"] == "success" for result in document_results):
+            self._record_directory_sentinel(sentinel_key, fingerprint)
 
         results = {
             "document_type": "mvsr_evidence",
@@ -415,7 +457,9 @@ class DocumentIngestionPipeline:
                 "Extracting text from the PDF...",
                 debug_trace_id=trace_id,
             )
-            text, metadata = self.pdf_loader.load_pdf(str(path_obj), document_type)
+            text, metadata = self.pdf_loader.load_pdf(
+                str(path_obj), document_type, file_hash=self._known_file_hash(path_obj)
+            )
 
             if additional_metadata:
                 for key, value in additional_metadata.items():
@@ -534,12 +578,7 @@ class DocumentIngestionPipeline:
                 document_type,
             )
 
-            if document_type == "naac_requirement":
-                self.vector_store.add_naac_documents(documents, metadatas)
-            elif document_type == "mvsr_evidence":
-                self.vector_store.add_mvsr_documents(documents, metadatas)
-            else:
-                raise ValueError(f"Invalid document type: {document_type}")
+            self._write_rows(document_type, documents, metadatas)
 
             # Confirm with stats after write
             try:
@@ -600,21 +639,15 @@ class DocumentIngestionPipeline:
     def get_ingestion_statistics(self) -> Dict[str, Any]:
         """Get comprehensive ingestion statistics"""
         vector_stats = self.vector_store.get_collection_stats()
-
-        naac_files = len(
-            [entry for entry in self.ingestion_log if entry.get("document_type") == "naac_requirement"]
-        )
-        mvsr_files = len(
-            [entry for entry in self.ingestion_log if entry.get("document_type") == "mvsr_evidence"]
-        )
+        type_counts = self.ingestion_log.counts_by_type()
 
         return {
             "vector_store_stats": vector_stats,
             "ingestion_history": {
-                "naac_files_ingested": naac_files,
-                "mvsr_files_ingested": mvsr_files,
-                "total_files_ingested": len(self.ingestion_log),
-                "last_ingestion": self.ingestion_log[-1]["timestamp"] if self.ingestion_log else None,
+                "naac_files_ingested": type_counts.get("naac_requirement", 0),
+                "mvsr_files_ingested": type_counts.get("mvsr_evidence", 0),
+                "total_files_ingested": sum(type_counts.values()),
+                "last_ingestion": self.ingestion_log.last_timestamp(),
             },
         }
 
@@ -799,12 +832,7 @@ class DocumentIngestionPipeline:
                 document_type,
             )
 
-            if document_type == "naac_requirement":
-                self.vector_store.add_naac_documents(documents, metadatas)
-            elif document_type == "mvsr_evidence":
-                self.vector_store.add_mvsr_documents(documents, metadatas)
-            else:
-                raise ValueError(f"Invalid document type: {document_type}")
+            self._write_rows(document_type, documents, metadatas)
 
             try:
                 stats = self.vector_store.get_collection_stats()
@@ -869,26 +897,166 @@ class DocumentIngestionPipeline:
 
     def _chunk_with_fallback(self, text: str, base_metadata: Dict[str, Any]) -> List[TextChunk]:
         """Chunk text and fallback to one cleaned chunk when structural chunking yields none."""
-        total_pages = int(base_metadata.get("total_pages", 1) or 1)
-        chunker = self.large_document_chunker if total_pages >= self.large_document_page_threshold else self.chunker
-        chunks = chunker.chunk_document(text, base_metadata)
-        if chunks:
-            return chunks
-
-        cleaned_text = " ".join((text or "").split())
-        if not cleaned_text:
-            return []
-
-        return [
-            TextChunk(
-                text=cleaned_text,
-                chunk_index=0,
-                start_page=1,
-                end_page=total_pages,
-                chunk_type="content",
-                metadata=base_metadata.copy(),
+        return _chunk_with_fallback(
+            text,
+            base_metadata,
+            self.chunker,
+            self.large_document_chunker,
+            self.large_document_page_threshold,
+        )
+
+    def _ingest_file_tasks(
+        self,
+        tasks: List[Tuple[Path, Dict[str, Any]]],
+        document_type: str,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Extract, chunk and store a list of (pdf_file, metadata_overrides) tasks."""
+        # Filled by task position so results keep directory order whichever file finishes first
+        document_results: List[Dict[str, Any]] = [{} for _ in tasks]
+        chunk_documents: List[str] = []
+        chunk_metadatas: List[Dict[str, Any]] = []
+        # Files whose rows are still buffered; logged only once those rows are written
+        pending_logs: List[Tuple[Path, int]] = []
+        total_chunks_written = 0
+
+        for position, pdf_file, overrides, outcome, error in self._extract_files(tasks, document_type):
+            try:
+                if error is not None:
+                    raise error
+
+                metadata_dict, chunks = outcome
+                if not chunks:
+                    raise ValueError("No text chunks generated")
+
+                documents, metadatas = self._prepare_chunk_rows(chunks, metadata_dict)
+                chunk_documents.extend(documents)
+                chunk_metadatas.extend(metadatas)
+
+                pending_logs.append((pdf_file, len(chunks)))
+                document_results[position] = {
+                    "file": pdf_file.name,
+                    **self._describe_file_result(document_type, overrides, metadata_dict),
+                    "chunks": len(chunks),
+                    "status": "success",
+                }
+            except Exception as e:
+                logger.error("Failed to ingest %s document %s: %s", document_type, pdf_file.name, e)
+                document_results[position] = {
+                    "file": pdf_file.name,
+                    **self._describe_file_result(document_type, overrides, None),
+                    "chunks": 0,
+                    "status": "failed",
+                    "error": str(e),
+                }
+
+            total_chunks_written += self._flush_pending_rows(
+                document_type, chunk_documents, chunk_metadatas, pending_logs
             )
-        ]
+
+        total_chunks_written += self._flush_pending_rows(
+            document_type, chunk_documents, chunk_metadatas, pending_logs, force=True
+        )
+        return document_results, total_chunks_written
+
+    def _extract_files(
+        self,
+        tasks: List[Tuple[Path, Dict[str, Any]]],
+        document_type: str,
+    ) -> Iterator[
+        Tuple[int, Path, Dict[str, Any], Optional[Tuple[Dict[str, Any], List[TextChunk]]], Optional[Exception]]
+    ]:
+        """
+        Run PDF extraction and chunking for each task, yielding (task position, ...) tuples.
+
+        CPU-bound work fans out to a process pool when more than one file and more than
+        INLINE_EXTRACTION_MAX_BYTES are queued, and results arrive in completion order;
+        vector-store writes stay with the caller in this process.
+        """
+        # File hashes passed along are usually cache hits from the duplicate check,
+        # so extraction skips re-reading the file to hash it.
+        components = (
+            self.pdf_loader,
+            self.chunker,
+            self.large_document_chunker,
+            self.large_document_page_threshold,
+        )
+
+        sizes = [self._file_size(pdf_file) for pdf_file, _ in tasks]
+        workers = min(self.max_workers, len(tasks))
+        if sum(sizes) <= INLINE_EXTRACTION_MAX_BYTES:
+            # A few small PDFs finish before worker processes would even start
+            workers = 1
+        if workers <= 1:
+            for position, (pdf_file, overrides) in enumerate(tasks):
+                try:
+                    outcome = _extract_and_chunk(
+                        str(pdf_file), document_type, overrides, *components, self._known_file_hash(pdf_file)
+                    )
+                    yield position, pdf_file, overrides, outcome, None
+                except Exception as e:
+                    yield position, pdf_file, overrides, None, e
+            return
+
+        logger.info("Extracting %s %s files with %s worker processes", len(tasks), document_type, workers)
+        # Largest files first, so a big PDF does not start last and leave the other workers idle
+        queued = (
+            (position, tasks[position])
+            for position in sorted(range(len(tasks)), key=sizes.__getitem__, reverse=True)
+        )
+        # Spawned, not forked: a forked child would inherit the API process's threads,
+        # locks and open database handles in whatever state they were in
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_extraction_worker,
+            initargs=components,
+        ) as executor:
+            # Only a bounded window of files is in flight, so finished chunk lists waiting on
+            # vector-store writes never pile up for the whole directory.
+            pending: Dict[Future, int] = {}
+
+            def submit(count: int) -> None:
+                for position, (pdf_file, overrides) in islice(queued, count):
+                    future = executor.submit(
+                        _extract_and_chunk_in_worker,
+                        str(pdf_file),
+                        document_type,
+                        overrides,
+                        self._known_file_hash(pdf_file),
+                    )
+                    pending[future] = position
+
+            submit(workers * EXTRACTION_WINDOW_PER_WORKER)
+            while pending:
+                # Hand files over as they finish so one large PDF does not hold back writes for the rest
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position = pending.pop(future)
+                    submit(1)
+                    pdf_file, overrides = tasks[position]
+                    try:
+                        yield position, pdf_file, overrides, future.result(), None
+                    except Exception as e:
+                        yield position, pdf_file, overrides, None, e
+
+    def _describe_file_result(
+        self,
+        document_type: str,
+        overrides: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Per-file summary fields reported by directory ingestion."""
+        if document_type == "naac_requirement":
+            if metadata is None:
+                return {"criterion": overrides.get("criterion", "unknown")}
+            return {"criterion": metadata.get("criterion") or "general"}
+
+        if metadata is None:
+            return {"category": overrides.get("category", "unknown")}
+        return {
+            "category": metadata.get("category") or "general",
+            "mapped_criterion": metadata.get("criterion"),
+        }
 
     def _prepare_chunk_rows(
         self,
@@ -899,6 +1067,8 @@ class DocumentIngestionPipeline:
         documents: List[str] = []
         metadatas: List[Dict[str, Any]] = []
         seen_documents = set()
+        # Fields shared by every row of this file, resolved once instead of per chunk.
+        file_metadata = {**base_metadata, "storage_mode": "chunk_row"}
 
         for chunk in chunks:
             cleaned_text = self._clean_chunk_text(chunk.text)
@@ -910,26 +1080,73 @@ class DocumentIngestionPipeline:
             seen_documents.add(cleaned_text)
             documents.append(cleaned_text)
 
-            metadata = self._build_chunk_metadata(base_metadata, chunk)
+            metadata = self._build_chunk_metadata(file_metadata, chunk)
             metadata["chunk_length"] = len(cleaned_text)
             metadatas.append(metadata)
 
         return documents, metadatas
 
+    def _write_rows(
+        self,
+        document_type: str,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Send prepared rows to the collection matching the document type."""
+        if document_type == "naac_requirement":
+            self.vector_store.add_naac_documents(documents, metadatas)
+        elif document_type == "mvsr_evidence":
+            self.vector_store.add_mvsr_documents(documents, metadatas)
+        else:
+            raise ValueError(f"Invalid document type: {document_type}")
+
+        for callback in self._write_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Ingestion write listener failed: %s", e)
+
+    def _flush_pending_rows(
+        self,
+        document_type: str,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        pending_logs: List[Tuple[Path, int]],
+        force: bool = False,
+    ) -> int:
+        """
+        Write buffered rows once the batch size is reached (or always when forced),
+        then record the files those rows came from in the ingestion log.
+
+        Callers flush between files so one file's chunks never straddle two writes;
+        the Supabase store replaces existing rows per file hash on every call.
+        """
+        if not force and len(documents) < self.write_batch_size:
+            return 0
+
+        written = 0
+        if documents:
+            self._write_rows(document_type, documents, metadatas)
+            written = len(documents)
+            documents.clear()
+            metadatas.clear()
+        for pdf_file, chunk_count in pending_logs:
+            self._log_ingestion(pdf_file, document_type, chunk_count)
+        pending_logs.clear()
+        return written
+
     def _build_chunk_metadata(self, base_metadata: Dict[str, Any], chunk: TextChunk) -> Dict[str, Any]:
-        """Merge base document metadata with chunk fields."""
-        merged = base_metadata.copy()
-        merged.update(chunk.metadata or {})
-        merged.update(
-            {
-                "chunk_index": chunk.chunk_index,
-                "start_page": chunk.start_page,
-                "end_page": chunk.end_page,
-                "chunk_type": chunk.chunk_type,
-                "storage_mode": "chunk_row",
-                "source_file": merged.get("source_file") or merged.get("file_name", ""),
-            }
-        )
+        """Merge base document metadata with chunk fields into one new dict."""
+        merged = {
+            **base_metadata,
+            **(chunk.metadata or {}),
+            "chunk_index": chunk.chunk_index,
+            "start_page": chunk.start_page,
+            "end_page": chunk.end_page,
+            "chunk_type": chunk.chunk_type,
+            "storage_mode": "chunk_row",
+        }
+        merged["source_file"] = merged.get("source_file") or merged.get("file_name", "")
         merged["section_header"] = self._derive_section_header(chunk, merged)
         return merged
 
@@ -967,8 +1184,9 @@ class DocumentIngestionPipeline:
     def _clean_chunk_text(self, text: str) -> str:
         """Remove page markers and noisy whitespace before embedding."""
         cleaned = text or ""
-        cleaned = re.sub(r"---\s*Page\s+\d+\s*---", " ", cleaned)
-        cleaned = re.sub(r"---\s*Table\s+\d+\s+on\s+Page\s+\d+\s*---", " ", cleaned)
+        if "---" in cleaned:
+            cleaned = _PAGE_MARKER_RE.sub(" ", cleaned)
+            cleaned = _TABLE_MARKER_RE.sub(" ", cleaned)
         cleaned = cleaned.replace("\uf0b7", " ")
         cleaned = cleaned.replace("â€¢", " ")
         cleaned = cleaned.replace("Â·", " ")
@@ -986,11 +1204,11 @@ class DocumentIngestionPipeline:
         for line in chunk_lines:
             if not line:
                 continue
-            if re.match(r"^---\s*(?:Page|Table)\b", line, re.IGNORECASE):
+            if _MARKER_LINE_RE.match(line):
                 continue
             if len(line) < 3:
                 continue
-            compact = re.sub(r"\s+", " ", line).strip(" -:|")
+            compact = _WHITESPACE_RE.sub(" ", line).strip(" -:|")
             if compact:
                 return compact[:200]
 
@@ -1006,20 +1224,23 @@ class DocumentIngestionPipeline:
 
     def _is_document_ingested(self, file_path: Path, document_type: str) -> bool:
         """Check if document was already ingested."""
-        file_hash = self._calculate_file_hash(file_path)
-        for entry in self.ingestion_log:
-            if entry.get("file_hash") == file_hash and entry.get("document_type") == document_type:
-                return True
-        return False
+        # An unchanged path, size and mtime matches without reading the file at all
+        stat = os.stat(file_path)
+        if self.ingestion_log.contains_path(str(file_path), document_type, stat.st_size, stat.st_mtime_ns):
+            return True
+        return self.ingestion_log.contains(self._calculate_file_hash(file_path), document_type)
 
     def _log_ingestion(self, file_path: Path, document_type: str, chunk_count: int):
         """Log successful document ingestion."""
+        stat = os.stat(file_path)
         entry = self._log_ingestion_entry(
             file_identifier=str(file_path),
             file_name=file_path.name,
             file_hash=self._calculate_file_hash(file_path),
             document_type=document_type,
             chunk_count=chunk_count,
+            file_size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
         )
         return entry
 
@@ -1031,6 +1252,8 @@ class DocumentIngestionPipeline:
         file_hash: str,
         document_type: str,
         chunk_count: int,
+        file_size: Optional[int] = None,
+        mtime_ns: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Log successful ingestion without assuming a filesystem path."""
         entry = {
@@ -1039,46 +1262,102 @@ class DocumentIngestionPipeline:
             "file_hash": file_hash,
             "document_type": document_type,
             "chunk_count": chunk_count,
+            "file_size": file_size,
+            "mtime_ns": mtime_ns,
             "timestamp": datetime.now().isoformat(),
         }
-        self.ingestion_log.append(entry)
-        self._save_ingestion_log()
+        self.ingestion_log.record(entry)
         return entry
 
     def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate SHA-256 hash of file."""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()[:16]
-
-    def _load_ingestion_log(self) -> List[Dict[str, Any]]:
-        """Load ingestion log from file."""
-        if not self.persist_ingestion_log:
-            return []
-        log_file = Path("ingestion_log.json")
-        if log_file.exists():
-            try:
-                with open(log_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning("Could not load ingestion log: %s", e)
-        return []
+        """Calculate SHA-256 hash of file, reusing the digest while its mtime and size are unchanged."""
+        stat = os.stat(file_path)
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        file_hash = self._hash_cache.get(key)
+        if file_hash is None:
+            file_hash = calculate_file_hash(file_path)
+            self._hash_cache[key] = file_hash
+        return file_hash
+
+    def _file_size(self, file_path: Path) -> int:
+        """Size in bytes used to schedule extraction; unreadable files count as empty."""
+        try:
+            return os.stat(file_path).st_size
+        except OSError:
+            return 0
+
+    def _known_file_hash(self, file_path: Path) -> Optional[str]:
+        """File hash to hand to the PDF loader, or None so the loader reports unreadable files itself."""
+        try:
+            return self._calculate_file_hash(file_path)
+        except OSError:
+            return None
+
+    def _directory_fingerprint(
+        self,
+        root_pdfs: List[os.DirEntry],
+        subdirectory_pdfs: List[Tuple[os.DirEntry, List[os.DirEntry]]],
+    ) -> str:
+        """Hash (name, mtime, size) of every PDF found by _scan_pdf_tree."""
+        scanned = [("", entry) for entry in root_pdfs]
+        for subdirectory, pdf_entries in subdirectory_pdfs:
+            scanned.extend((f"{subdirectory.name}/", entry) for entry in pdf_entries)
+
+        entries = []
+        for prefix, entry in scanned:
+            stat = entry.stat()
+            entries.append((prefix + entry.name, stat.st_mtime_ns, stat.st_size))
+        payload = json.dumps(sorted(entries), separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _directory_unchanged(self, sentinel_key: str, fingerprint: str) -> bool:
+        """Check a directory against the fingerprint recorded after its last clean ingestion."""
+        sentinel = self.directory_sentinels.get(sentinel_key)
+        return bool(sentinel) and sentinel.get("fingerprint") == fingerprint
+
+    def _unchanged_directory_result(self, document_type: str, **extra: Any) -> Dict[str, Any]:
+        return {
+            "document_type": document_type,
+            "total_files_processed": 0,
+            "successful_files": 0,
+            "total_chunks_written": 0,
+            **extra,
+            "unchanged": True,
+            "ingestion_timestamp": datetime.now().isoformat(),
+            "detailed_results": [],
+        }
 
-    def _save_ingestion_log(self):
-        """Save ingestion log to file."""
+    def _record_directory_sentinel(self, sentinel_key: str, fingerprint: str):
+        """Remember a cleanly ingested directory so unchanged reruns skip file hashing."""
         if not self.persist_ingestion_log:
             return
-        log_file = Path("ingestion_log.json")
+        self.directory_sentinels[sentinel_key] = {
+            "fingerprint": fingerprint,
+            "timestamp": datetime.now().isoformat(),
+        }
         try:
-            with open(log_file, "w", encoding="utf-8") as f:
-                json.dump(self.ingestion_log, f, indent=2)
+            with open(DIRECTORY_SENTINEL_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.directory_sentinels, f, indent=2)
         except Exception as e:
-            logger.error("Could not save ingestion log: %s", e)
+            logger.error("Could not save directory sentinels: %s", e)
+
+    def _load_directory_sentinels(self) -> Dict[str, Dict[str, Any]]:
+        """Load directory fingerprints recorded by earlier runs."""
+        if not self.persist_ingestion_log:
+            return {}
+        sentinel_file = Path(DIRECTORY_SENTINEL_FILE)
+        if sentinel_file.exists():
+            try:
+                with open(sentinel_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning("Could not load directory sentinels: %s", e)
+        return {}
 
     def clear_ingestion_log(self):
         """Clear the ingestion log (use with caution)."""
-        self.ingestion_log = []
-        self._save_ingestion_log()
+        self.ingestion_log.clear()
+        self.directory_sentinels = {}
+        if self.persist_ingestion_log:
+            Path(DIRECTORY_SENTINEL_FILE).unlink(missing_ok=True)
         logger.info("Ingestion log cleared")
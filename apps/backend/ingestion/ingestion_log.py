@@ -0,0 +1,152 @@
+"""SQLite record of ingested files used for duplicate detection.
+
+Each (file_hash, document_type) pair is one row, so duplicate checks and
+per-type counts are indexed queries and a new ingestion is a single INSERT
+instead of a reload or rewrite of the whole history. Rows also keep the file's
+size and mtime so an untouched file can be recognised without hashing it.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Pre-SQLite log files, imported once and then removed.
+LEGACY_LOG_FILES = ("ingestion_log.jsonl", "ingestion_log.json")
+
+
+class IngestionLog:
+    """Thread-safe ingestion history, on disk or in memory."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite file to keep the history in; None keeps it in memory for this process
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.db_path) if self.db_path else ":memory:", check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ingested (
+                    file_hash TEXT NOT NULL,
+                    document_type TEXT NOT NULL,
+                    file_path TEXT,
+                    file_name TEXT,
+                    chunk_count INTEGER,
+                    timestamp TEXT,
+                    file_size INTEGER,
+                    mtime_ns INTEGER,
+                    PRIMARY KEY (file_hash, document_type)
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(ingested)")}
+            for column in ("file_size", "mtime_ns"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE ingested ADD COLUMN {column} INTEGER")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ingested_by_path ON ingested (file_path, document_type)"
+            )
+            self._conn.commit()
+
+        if self.db_path is not None:
+            self._import_legacy_logs(self.db_path.parent)
+
+    def contains(self, file_hash: str, document_type: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM ingested WHERE file_hash = ? AND document_type = ?",
+                (file_hash, document_type),
+            ).fetchone()
+        return row is not None
+
+    def contains_path(self, file_path: str, document_type: str, file_size: int, mtime_ns: int) -> bool:
+        """True when this exact path was ingested with the same size and modification time."""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT 1 FROM ingested
+                WHERE file_path = ? AND document_type = ? AND file_size = ? AND mtime_ns = ?
+                """,
+                (file_path, document_type, file_size, mtime_ns),
+            ).fetchone()
+        return row is not None
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Store one ingestion; re-ingesting a file replaces its earlier row."""
+        self._insert([entry])
+
+    def counts_by_type(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT document_type, COUNT(*) FROM ingested GROUP BY document_type"
+            ).fetchall()
+        return dict(rows)
+
+    def last_timestamp(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(timestamp) FROM ingested").fetchone()
+        return row[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ingested")
+            self._conn.commit()
+
+    def _insert(self, entries: List[Dict[str, Any]]) -> None:
+        rows = [
+            (
+                entry.get("file_hash"),
+                entry.get("document_type"),
+                entry.get("file_path"),
+                entry.get("file_name"),
+                entry.get("chunk_count"),
+                entry.get("timestamp"),
+                entry.get("file_size"),
+                entry.get("mtime_ns"),
+            )
+            for entry in entries
+            if entry.get("file_hash") and entry.get("document_type")
+        ]
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO ingested
+                    (file_hash, document_type, file_path, file_name, chunk_count, timestamp, file_size, mtime_ns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.commit()
+
+    def _import_legacy_logs(self, directory: Path) -> None:
+        for name in LEGACY_LOG_FILES:
+            legacy_file = directory / name
+            if not legacy_file.exists():
+                continue
+            try:
+                raw = legacy_file.read_bytes()
+                if name.endswith(".jsonl"):
+                    entries = []
+                    for line in raw.splitlines():
+                        try:
+                            entries.append(orjson.loads(line))
+                        except orjson.JSONDecodeError:
+                            continue
+                else:
+                    entries = orjson.loads(raw)
+                self._insert(entries)
+            except Exception as e:
+                logger.warning("Could not import legacy ingestion log %s: %s", legacy_file, e)
+                continue
+            legacy_file.unlink(missing_ok=True)
+            logger.info("Imported %s legacy ingestion log entries from %s", len(entries), legacy_file)
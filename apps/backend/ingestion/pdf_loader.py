@@ -6,16 +6,128 @@ Handles PDF extraction with metadata preservation
 import pdfplumber
 import PyPDF2
 import io
+import mmap
+import multiprocessing
+import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import hashlib
 import logging
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from threading import Lock
+
+try:
+    import fitz  # PyMuPDF
+    _HAS_PYMUPDF = True
+except ImportError:
+    _HAS_PYMUPDF = False
 
 logger = logging.getLogger(__name__)
 
+# One pass over the document finds every explicit criterion reference;
+# the lowest referenced criterion wins, as with the former per-criterion scan.
+_NAAC_CRITERION_RE = re.compile(r"criterion\s*[:-]?\s*([1-7])\b", re.IGNORECASE)
+_NAAC_INDICATOR_RE = re.compile(
+    r"\b(?:indicator|key\s*indicator)\s*[:-]?\s*(\d+\.\d+\.\d+)\b", re.IGNORECASE
+)
+_YEAR_RE = re.compile(r"20\d{2}")
+
+# Criterion, indicator, year, category and title come from the cover and
+# opening pages, so those searches only look at this much of the text
+METADATA_HEAD_CHARS = 64 * 1024
+
+# MVSR document category patterns, checked in priority order
+_MVSR_CATEGORY_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), category)
+    for pattern, category in (
+        (r"(?:policy|policies)", "policies"),
+        (r"(?:iqac|internal.*quality)", "iqac"),
+        (r"(?:governance|governing|management)", "governance"),
+        (r"(?:student.*support|support.*student)", "student_support"),
+        (r"(?:report|annual.*report|self.*study)", "reports"),
+    )
+]
+_PAGE_LINE_RE = re.compile(r"^page\s*\d+", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Lowercase content keywords used to map MVSR evidence to a NAAC criterion
+_MVSR_CRITERION_KEYWORDS = {
+    '1': ['vision', 'mission', 'planning', 'strategic', 'institutional', 'leadership'],
+    '2': ['teaching', 'learning', 'student', 'academic', 'curriculum', 'faculty'],
+    '3': ['research', 'innovation', 'consultancy', 'extension', 'outreach'],
+    '4': ['infrastructure', 'facility', 'library', 'laboratory', 'ict', 'technology'],
+    '5': ['student support', 'progression', 'guidance', 'counseling', 'placement'],
+    '6': ['governance', 'leadership', 'management', 'finance', 'administration'],
+    '7': ['innovation', 'best practices', 'institutional distinctiveness']
+}
+_MVSR_CRITERION_KEYWORD_SET = frozenset(
+    keyword for keywords in _MVSR_CRITERION_KEYWORDS.values() for keyword in keywords
+)
+# Text is lowercased for the keyword scan this many characters at a time
+_KEYWORD_SCAN_BLOCK = 64 * 1024
+_KEYWORD_SCAN_OVERLAP = max(len(keyword) for keyword in _MVSR_CRITERION_KEYWORD_SET) - 1
+
+# pdfplumber documents with at least this many pages are extracted in
+# PAGE_BLOCK_SIZE-page blocks across processes
+PARALLEL_EXTRACTION_MIN_PAGES = 40
+PAGE_BLOCK_SIZE = 10
+
+# Set by mark_extraction_worker in ingestion pool workers, which already run
+# one file per process and must not start page-block pools of their own
+_IN_EXTRACTION_WORKER = False
+# Page-block pool shared by every load in this process, started on first use
+_PAGE_BLOCK_POOL: Optional[ProcessPoolExecutor] = None
+_PAGE_BLOCK_POOL_LOCK = Lock()
+
+
+def mark_extraction_worker() -> None:
+    """Keep pdfplumber extraction in this process; called by ingestion pool initializers."""
+    global _IN_EXTRACTION_WORKER
+    _IN_EXTRACTION_WORKER = True
+
+
+def _get_page_block_pool() -> ProcessPoolExecutor:
+    global _PAGE_BLOCK_POOL
+    with _PAGE_BLOCK_POOL_LOCK:
+        if _PAGE_BLOCK_POOL is None:
+            # Spawned, not forked, so workers don't inherit the API process's threads and locks
+            _PAGE_BLOCK_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PAGE_BLOCK_POOL
+
+
+def _discard_page_block_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died so the next large document starts a fresh one."""
+    global _PAGE_BLOCK_POOL
+    with _PAGE_BLOCK_POOL_LOCK:
+        if _PAGE_BLOCK_POOL is pool:
+            _PAGE_BLOCK_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_page_block_pool() -> None:
+    """Stop the shared page-block worker processes, if any were started."""
+    global _PAGE_BLOCK_POOL
+    with _PAGE_BLOCK_POOL_LOCK:
+        pool, _PAGE_BLOCK_POOL = _PAGE_BLOCK_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def calculate_file_hash(file_path) -> str:
+    """SHA-256 of a file (first 16 hex characters), hashed straight from a memory map."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256(b"").hexdigest()[:16]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()[:16]
+
 @dataclass
 class DocumentMetadata:
     """Structure for document metadata"""
@@ -52,34 +164,23 @@ class PDFLoader:
         self.preferred_extractor = (preferred_extractor or "auto").strip().lower()
         self.extract_tables = bool(extract_tables)
         self.large_document_page_threshold = max(int(large_document_page_threshold or 120), 1)
-        self.naac_criterion_patterns = {
-            r'criterion\s*[:-]?\s*1\b': '1',
-            r'criterion\s*[:-]?\s*2\b': '2', 
-            r'criterion\s*[:-]?\s*3\b': '3',
-            r'criterion\s*[:-]?\s*4\b': '4',
-            r'criterion\s*[:-]?\s*5\b': '5',
-            r'criterion\s*[:-]?\s*6\b': '6',
-            r'criterion\s*[:-]?\s*7\b': '7'
-        }
-        
-        self.indicator_pattern = r'\b(?:indicator|key\s*indicator)\s*[:-]?\s*(\d+\.\d+\.\d+)\b'
-        
-        # MVSR document category patterns
-        self.mvsr_patterns = {
-            r'(?:policy|policies)': 'policies',
-            r'(?:iqac|internal.*quality)': 'iqac',
-            r'(?:governance|governing|management)': 'governance',
-            r'(?:student.*support|support.*student)': 'student_support',
-            r'(?:report|annual.*report|self.*study)': 'reports'
-        }
-    
-    def load_pdf(self, file_path: str, document_type: str) -> Tuple[str, DocumentMetadata]:
+
+    def load_pdf(
+        self,
+        file_path: str,
+        document_type: str,
+        file_hash: Optional[str] = None,
+        extract_tables: Optional[bool] = None,
+    ) -> Tuple[str, DocumentMetadata]:
         """
         Load PDF and extract text with metadata inference
         
         Args:
             file_path: Path to PDF file
             document_type: 'naac_requirement' or 'mvsr_evidence'
+            file_hash: Hash already computed by the caller; skips re-reading the file
+            extract_tables: Whether tables are needed (defaults to the loader setting);
+                tables route extraction through pdfplumber instead of PyMuPDF
             
         Returns:
             Tuple of (extracted_text, metadata)
@@ -90,18 +191,19 @@ class PDFLoader:
             raise FileNotFoundError(f"PDF file not found: {file_path}")
         
         estimated_pages = self._get_pdf_page_count(file_path)
+        include_tables = self.extract_tables if extract_tables is None else bool(extract_tables)
         extraction_method = None
         text = ""
         pages = estimated_pages
         last_error = None
 
-        for method in self._choose_extraction_plan(estimated_pages):
+        for method in self._choose_extraction_plan(estimated_pages, include_tables):
             started = time.time()
             try:
                 if method == "pymupdf":
                     text, pages = self._extract_with_pymupdf(file_path)
                 elif method == "pdfplumber":
-                    text, pages = self._extract_with_pdfplumber(file_path, extract_tables=self.extract_tables)
+                    text, pages = self._extract_with_pdfplumber(file_path, extract_tables=include_tables)
                 else:
                     text, pages = self._extract_with_pypdf2(file_path)
 
@@ -131,7 +233,8 @@ class PDFLoader:
             raise last_error or RuntimeError(f"Could not extract text from {file_path.name}")
         
         # Generate file hash for duplicate detection
-        file_hash = self._calculate_file_hash(file_path)
+        if file_hash is None:
+            file_hash = self._calculate_file_hash(file_path)
         
         # Create base metadata
         metadata = DocumentMetadata(
@@ -157,6 +260,7 @@ class PDFLoader:
         file_name: str,
         document_type: str,
         file_identifier: Optional[str] = None,
+        extract_tables: Optional[bool] = None,
     ) -> Tuple[str, DocumentMetadata]:
         """
         Load an in-memory PDF and extract text with metadata inference.
@@ -170,12 +274,13 @@ class PDFLoader:
         file_identifier = (file_identifier or safe_name).strip() or safe_name
 
         estimated_pages = self._get_pdf_page_count_from_bytes(file_bytes)
+        include_tables = self.extract_tables if extract_tables is None else bool(extract_tables)
         extraction_method = None
         text = ""
         pages = estimated_pages
         last_error = None
 
-        for method in self._choose_extraction_plan(estimated_pages):
+        for method in self._choose_extraction_plan(estimated_pages, include_tables):
             started = time.time()
             try:
                 if method == "pymupdf":
@@ -184,7 +289,7 @@ class PDFLoader:
                     text, pages = self._extract_with_pdfplumber_bytes(
                         file_bytes,
                         safe_name,
-                        extract_tables=self.extract_tables,
+                        extract_tables=include_tables,
                     )
                 else:
                     text, pages = self._extract_with_pypdf2_bytes(file_bytes, safe_name)
@@ -237,52 +342,99 @@ class PDFLoader:
         
         with pdfplumber.open(file_path) as pdf:
             total_pages = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages):
-                try:
-                    # Extract text
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}\n")
-                    
-                    # Extract tables if present
-                    if include_tables:
-                        tables = page.extract_tables()
-                        if tables:
-                            for table_num, table in enumerate(tables):
-                                table_text = self._format_table(table)
-                                text_parts.append(f"--- Table {table_num + 1} on Page {page_num + 1} ---\n{table_text}\n")
-                
-                except Exception as e:
-                    logger.warning(f"Error extracting page {page_num + 1} from {file_path.name}: {e}")
-                    continue
+            parallel = self._use_page_blocks(total_pages)
+            if not parallel:
+                for page_num, page in enumerate(pdf.pages):
+                    text_parts.extend(self._pdfplumber_page_parts(page, page_num, include_tables, file_path.name))
+        
+        if parallel:
+            # Pages are independent once parsed, so blocks of them are extracted in
+            # separate processes, each re-opening the file; results stay in page order
+            pool = _get_page_block_pool()
+            try:
+                blocks = [
+                    pool.submit(self._extract_pdfplumber_page_block, str(file_path), start, include_tables)
+                    for start in range(0, total_pages, PAGE_BLOCK_SIZE)
+                ]
+                for block in blocks:
+                    text_parts.extend(block.result())
+            except BrokenProcessPool:
+                _discard_page_block_pool(pool)
+                raise
         
         return "\n".join(text_parts), total_pages
 
+    def _use_page_blocks(self, total_pages: int) -> bool:
+        """Whether to spread a document's pages over the shared page-block pool."""
+        if total_pages < PARALLEL_EXTRACTION_MIN_PAGES or _IN_EXTRACTION_WORKER:
+            # Ingestion workers already keep every core busy with a file each
+            return False
+        return (os.cpu_count() or 1) > 1
+
+    def _extract_pdfplumber_page_block(self, file_path: str, start: int, include_tables: bool) -> List[str]:
+        """Pool task: extract pages [start, start + PAGE_BLOCK_SIZE) of one PDF."""
+        file_name = Path(file_path).name
+        parts: List[str] = []
+        with pdfplumber.open(file_path) as pdf:
+            for page_num in range(start, min(start + PAGE_BLOCK_SIZE, len(pdf.pages))):
+                parts.extend(self._pdfplumber_page_parts(pdf.pages[page_num], page_num, include_tables, file_name))
+        return parts
+
+    def _pdfplumber_page_parts(self, page, page_num: int, include_tables: bool, file_name: str) -> List[str]:
+        """Text and table sections of one pdfplumber page."""
+        parts = []
+        try:
+            # Extract text
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(f"--- Page {page_num + 1} ---\n{page_text}\n")
+            
+            # Extract tables if present; the default line-based table finder only
+            # looks at ruling lines, so pages drawn without any cannot hold a table
+            if include_tables and (page.lines or page.rects or page.curves):
+                tables = page.extract_tables()
+                if tables:
+                    for table_num, table in enumerate(tables):
+                        table_text = self._format_table(table)
+                        parts.append(f"--- Table {table_num + 1} on Page {page_num + 1} ---\n{table_text}\n")
+        
+        except Exception as e:
+            logger.warning(f"Error extracting page {page_num + 1} from {file_name}: {e}")
+        return parts
+
     def _get_pdf_page_count(self, file_path: Path) -> int:
         """Get PDF page count quickly to decide whether to use the fast path."""
+        if _HAS_PYMUPDF:
+            # PyMuPDF reads the page tree in C; PyPDF2 parses it in Python
+            try:
+                with fitz.open(str(file_path)) as doc:
+                    return len(doc)
+            except Exception as e:
+                logger.debug(f"PyMuPDF could not count pages of {file_path.name}: {e}")
         with open(file_path, "rb") as file:
             reader = PyPDF2.PdfReader(file)
             return len(reader.pages)
 
     def _get_pdf_page_count_from_bytes(self, file_bytes: bytes) -> int:
         """Get PDF page count from in-memory bytes."""
+        if _HAS_PYMUPDF:
+            try:
+                with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+                    return len(doc)
+            except Exception as e:
+                logger.debug(f"PyMuPDF could not count pages of in-memory PDF: {e}")
         reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
         return len(reader.pages)
 
-    def _choose_extraction_plan(self, total_pages: int) -> List[str]:
+    def _choose_extraction_plan(self, total_pages: int, include_tables: bool = False) -> List[str]:
         """Choose the fastest extractor order for the current document size."""
-        has_pymupdf = False
-        try:
-            import fitz
-            has_pymupdf = True
-        except ImportError:
-            pass
-            
-        if has_pymupdf:
+        if _HAS_PYMUPDF:
             # PyMuPDF is extremely fast and robust, use it first to handle 300+ pages instantly
             if total_pages >= self.large_document_page_threshold:
                 return ["pymupdf", "pypdf2"]
+            if include_tables:
+                # Only pdfplumber recovers table structure
+                return ["pdfplumber", "pymupdf", "pypdf2"]
             return ["pymupdf", "pdfplumber", "pypdf2"]
 
         if self.preferred_extractor in {"fast", "pypdf2"}:
@@ -295,13 +447,12 @@ class PDFLoader:
 
     def _is_usable_extraction(self, text: str, total_pages: int) -> bool:
         """Reject empty or clearly broken extraction results before ingestion."""
-        cleaned = re.sub(r"\s+", "", text or "")
+        cleaned = _WHITESPACE_RE.sub("", text or "")
         minimum_chars = max(200, total_pages * 40)
         return len(cleaned) >= minimum_chars
 
     def _extract_with_pymupdf(self, file_path: Path) -> Tuple[str, int]:
         """Lightning fast extraction using PyMuPDF (fitz) for huge docs"""
-        import fitz
         text_parts = []
         with fitz.open(str(file_path)) as doc:
             total_pages = len(doc)
@@ -317,8 +468,6 @@ class PDFLoader:
 
     def _extract_with_pymupdf_bytes(self, file_bytes: bytes, file_name: str) -> Tuple[str, int]:
         """Lightning fast extraction using PyMuPDF from raw bytes."""
-        import fitz
-
         text_parts = []
         with fitz.open(stream=file_bytes, filetype="pdf") as doc:
             total_pages = len(doc)
@@ -365,22 +514,7 @@ class PDFLoader:
             total_pages = len(pdf.pages)
 
             for page_num, page in enumerate(pdf.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}\n")
-
-                    if include_tables:
-                        tables = page.extract_tables()
-                        if tables:
-                            for table_num, table in enumerate(tables):
-                                table_text = self._format_table(table)
-                                text_parts.append(
-                                    f"--- Table {table_num + 1} on Page {page_num + 1} ---\n{table_text}\n"
-                                )
-                except Exception as e:
-                    logger.warning(f"Error extracting page {page_num + 1} from {file_name}: {e}")
-                    continue
+                text_parts.extend(self._pdfplumber_page_parts(page, page_num, include_tables, file_name))
 
         return "\n".join(text_parts), total_pages
 
@@ -417,13 +551,7 @@ class PDFLoader:
     
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA-256 hash of file for duplicate detection"""
-        hash_sha256 = hashlib.sha256()
-        
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        
-        return hash_sha256.hexdigest()[:16]  # First 16 characters
+        return calculate_file_hash(file_path)
 
     def _calculate_content_hash(self, file_bytes: bytes) -> str:
         """Calculate SHA-256 hash of in-memory file content."""
@@ -431,30 +559,28 @@ class PDFLoader:
     
     def _infer_naac_metadata(self, text: str, filename: str, metadata: DocumentMetadata):
         """Infer NAAC-specific metadata from text content"""
-        text_lower = text.lower()
-        
+        head = text[:METADATA_HEAD_CHARS]
         # Detect criterion
-        for pattern, criterion in self.naac_criterion_patterns.items():
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                metadata.criterion = criterion
-                logger.debug(f"Detected NAAC criterion {criterion} in {filename}")
-                break
+        criterion = min(_NAAC_CRITERION_RE.findall(head), default=None)
+        if criterion:
+            metadata.criterion = criterion
+            logger.debug(f"Detected NAAC criterion {metadata.criterion} in {filename}")
         
         # Detect indicator
-        indicator_match = re.search(self.indicator_pattern, text_lower, re.IGNORECASE)
+        indicator_match = _NAAC_INDICATOR_RE.search(head)
         if indicator_match:
             metadata.indicator = indicator_match.group(1)
             logger.debug(f"Detected NAAC indicator {metadata.indicator} in {filename}")
         
         # Detect version/year from filename or text
-        year_match = re.search(r'(?:20\d{2}|2025|2024|2023)', text + " " + filename)
+        year_match = _YEAR_RE.search(head) or _YEAR_RE.search(filename)
         if year_match:
             metadata.version = year_match.group(0)
         else:
             metadata.version = "2025"  # Default to current
         
         # Extract document title from first few lines
-        lines = text.split('\n')[:10]
+        lines = head.split('\n', 10)[:10]
         for line in lines:
             clean_line = line.strip()
             if len(clean_line) > 10 and not clean_line.isdigit():
@@ -463,13 +589,10 @@ class PDFLoader:
     
     def _infer_mvsr_metadata(self, text: str, filename: str, metadata: DocumentMetadata):
         """Infer MVSR-specific metadata from text content"""
-        text_lower = text.lower()
-        filename_lower = filename.lower()
-        
-        # Detect category
-        combined_text = f"{text_lower} {filename_lower}"
-        for pattern, category in self.mvsr_patterns.items():
-            if re.search(pattern, combined_text, re.IGNORECASE):
+        head = text[:METADATA_HEAD_CHARS]
+        # Detect category from the text, falling back to the filename
+        for pattern, category in _MVSR_CATEGORY_PATTERNS:
+            if pattern.search(head) or pattern.search(filename):
                 metadata.category = category
                 logger.debug(f"Detected MVSR category {category} in {filename}")
                 break
@@ -478,21 +601,21 @@ class PDFLoader:
             metadata.category = "reports"  # Default category
         
         # Extract year
-        year_match = re.search(r'(?:20\d{2})', combined_text)
+        year_match = _YEAR_RE.search(head) or _YEAR_RE.search(filename)
         if year_match:
             metadata.year = int(year_match.group(0))
         else:
             metadata.year = 2023  # Default year
         
         # Extract document title
-        lines = text.split('\n')[:15]
+        lines = head.split('\n', 15)[:15]
         title_candidates = []
         
         for line in lines:
             clean_line = line.strip()
             if (len(clean_line) > 5 and 
                 not clean_line.isdigit() and 
-                not re.match(r'^page\s*\d+', clean_line, re.IGNORECASE)):
+                not _PAGE_LINE_RE.match(clean_line)):
                 title_candidates.append(clean_line)
         
         if title_candidates:
@@ -502,24 +625,27 @@ class PDFLoader:
             metadata.document_title = filename.replace('.pdf', '').replace('_', ' ').title()
         
         # Try to map to NAAC criterion based on content
-        self._map_mvsr_to_criterion(text_lower, metadata)
+        self._map_mvsr_to_criterion(text, metadata)
     
     def _map_mvsr_to_criterion(self, text: str, metadata: DocumentMetadata):
         """Map MVSR document to relevant NAAC criterion based on content"""
-        criterion_keywords = {
-            '1': ['vision', 'mission', 'planning', 'strategic', 'institutional', 'leadership'],
-            '2': ['teaching', 'learning', 'student', 'academic', 'curriculum', 'faculty'],
-            '3': ['research', 'innovation', 'consultancy', 'extension', 'outreach'],
-            '4': ['infrastructure', 'facility', 'library', 'laboratory', 'ict', 'technology'],
-            '5': ['student support', 'progression', 'guidance', 'counseling', 'placement'],
-            '6': ['governance', 'leadership', 'management', 'finance', 'administration'],
-            '7': ['innovation', 'best practices', 'institutional distinctiveness']
-        }
+        # Each distinct keyword is looked up once, even when it counts towards several criteria.
+        # Text is lowercased block by block (overlapping so no keyword is split) rather than
+        # copied whole, and the scan stops once every keyword has been seen.
+        found = set()
+        remaining = set(_MVSR_CRITERION_KEYWORD_SET)
+        for start in range(0, len(text), _KEYWORD_SCAN_BLOCK):
+            block = text[max(start - _KEYWORD_SCAN_OVERLAP, 0):start + _KEYWORD_SCAN_BLOCK].lower()
+            hits = {keyword for keyword in remaining if keyword in block}
+            found |= hits
+            remaining -= hits
+            if not remaining:
+                break
         
         # Score each criterion based on keyword matches
         scores = {}
-        for criterion, keywords in criterion_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
+        for criterion, keywords in _MVSR_CRITERION_KEYWORDS.items():
+            score = sum(1 for keyword in keywords if keyword in found)
             if score > 0:
                 scores[criterion] = score
         
@@ -141,14 +141,10 @@ class GroqClient:
             return False
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": "Reply exactly with OK."}],
-                temperature=0.0,
-                max_tokens=5,
-                top_p=1.0,
-            )
-            return bool(self._extract_message_content(response).strip())
+            # A model lookup confirms the key and model over the client's pooled
+            # connection without spending a completion on every health poll
+            model = self.client.models.retrieve(self.model_name)
+            return bool(getattr(model, "id", None))
         except Exception as exc:
             logger.debug("Groq connectivity test failed: %s", exc)
             return False
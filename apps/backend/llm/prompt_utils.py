@@ -5,6 +5,160 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List, Optional
 
+# Fixed instructions of the compliance prompt; only the placeholders change per query
+_COMPLIANCE_PROMPT_TEMPLATE = """You are AduBot, a focused NAAC compliance answer bot.
+Your job is to answer questions about NAAC requirements and institutional evidence using only the retrieved context.
+
+Primary task:
+{task_instructions}
+
+Operating rules:
+1) Treat NAAC requirement context as normative criteria when the user is asking for compliance or audit analysis.
+2) Treat college report/evidence context as claims or factual evidence to be validated against the user query.
+3) Answer only from the retrieved context and conversation memory shown below. Do not invent facts.
+4) If context is insufficient, say so plainly and list what is missing.
+5) IMPORTANT RULE FOR EVIDENCE LINKS: If the college evidence text mentions "View Document", "Link", or provides a URL/hyperlink, assume the relevant documentary evidence is already attached. Do not penalize missing attachment content when such markers are present.
+6) Do not repeat the same condition, evidence, judgment, recommendation, or conclusion in multiple places.
+7) If multiple retrieved chunks say the same thing, merge them into one point.
+8) Prefer a precise answer over an exhaustive but repetitive answer.
+9) If the user asks a narrow factual question, do not turn it into a full institutional audit.
+10) For direct factual questions, answer in the shortest correct form possible. If one line is enough, return one line only.
+11) AduBot should sound clear, exact, and helpful, not essay-like.
+12) In audit mode, every major finding must include at least one source citation tag like [NAAC-2] or [MVSR-4].
+13) In audit mode, map findings to criterion and metric IDs whenever present (for example 2.3.1, 6.5.2). If unavailable, write "Metric ID not found in retrieved context".
+14) In audit mode, quantify evidence gaps whenever possible (counts, percentages, years, accepted vs rejected values).
+
+User query:
+{user_query}
+
+Detected response mode:
+{response_mode}
+
+Retrieved metadata snapshot:
+- NAAC: {naac_meta_summary}
+- College evidence: {mvsr_meta_summary}
+
+Retrieved metric snapshot:
+- NAAC metric IDs: {naac_metric_snapshot}
+- College evidence metric IDs: {mvsr_metric_snapshot}
+
+Conversation memory:
+{memory_block}
+
+Retrieved context:
+{context_block}
+
+Source extracts for citation (use these IDs in your answer):
+{source_extract_block}
+
+{output_instructions}
+"""
+
+
+# Query cues used to pick between a short direct answer and a full audit
+_STRONG_AUDIT_KEYWORDS = (
+    "audit",
+    "compliance analysis",
+    "compliance gap",
+    "gap",
+    "analyze",
+    "analysis",
+    "evaluate",
+    "compare",
+    "comparison",
+    "difference",
+    "differences",
+    "weak claim",
+    "weakness",
+    "weaknesses",
+    "remediation",
+    "recommendation",
+    "satisfied",
+    "dvv",
+    "scoring",
+    "score risk",
+    "eligibility",
+)
+_DIRECT_PREFIXES = (
+    "what",
+    "which",
+    "who",
+    "when",
+    "where",
+    "why",
+    "how",
+    "is",
+    "are",
+    "does",
+    "do",
+    "can",
+    "did",
+    "tell me",
+    "give me",
+    "show me",
+    "list",
+    "provide",
+    "share",
+    "mention",
+)
+_STATEMENT_DIRECT_PREFIXES = (
+    "number of",
+    "count of",
+    "total number",
+    "list of",
+    "name of",
+)
+_DIRECT_PHRASES = (
+    "how many",
+    "number of",
+    "count of",
+    "total number",
+    "name of",
+    "list of",
+    "which courses",
+    "which program",
+    "what is the number",
+)
+_QUESTION_WORD_RE = re.compile(r"^(what|which|who|when|where|why|how|is|are|does|do|can|did)\b")
+_QUERY_WORD_RE = re.compile(r"[a-z0-9%]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_METRIC_ID_RE = re.compile(r"\b[1-7]\.\d(?:\.\d)?\b")
+_RESPONSE_SECTION_RE = re.compile(r"<(comprehensive_audit|status)>(.*?)</\1>", re.DOTALL)
+_FACTUAL_MARKERS = frozenset({
+    "number",
+    "count",
+    "total",
+    "list",
+    "name",
+    "courses",
+    "course",
+    "students",
+    "student",
+    "faculty",
+    "program",
+    "programs",
+    "year",
+    "years",
+    "percentage",
+    "percent",
+    "ratio",
+})
+_AUDIT_MARKERS = (
+    "gap",
+    "audit",
+    "analysis",
+    "analyze",
+    "evaluate",
+    "compare",
+    "comparison",
+    "remediation",
+    "weakness",
+    "dvv",
+    "risk",
+    "eligibility",
+    "compliance",
+)
+
 
 def build_compliance_prompt(
     user_query: str,
@@ -96,53 +250,19 @@ def build_compliance_prompt(
     task_instructions = _build_task_instructions(response_mode)
     output_instructions = _build_output_instructions(response_mode)
 
-    return f"""You are AduBot, a focused NAAC compliance answer bot.
-Your job is to answer questions about NAAC requirements and institutional evidence using only the retrieved context.
-
-Primary task:
-{task_instructions}
-
-Operating rules:
-1) Treat NAAC requirement context as normative criteria when the user is asking for compliance or audit analysis.
-2) Treat college report/evidence context as claims or factual evidence to be validated against the user query.
-3) Answer only from the retrieved context and conversation memory shown below. Do not invent facts.
-4) If context is insufficient, say so plainly and list what is missing.
-5) IMPORTANT RULE FOR EVIDENCE LINKS: If the college evidence text mentions "View Document", "Link", or provides a URL/hyperlink, assume the relevant documentary evidence is already attached. Do not penalize missing attachment content when such markers are present.
-6) Do not repeat the same condition, evidence, judgment, recommendation, or conclusion in multiple places.
-7) If multiple retrieved chunks say the same thing, merge them into one point.
-8) Prefer a precise answer over an exhaustive but repetitive answer.
-9) If the user asks a narrow factual question, do not turn it into a full institutional audit.
-10) For direct factual questions, answer in the shortest correct form possible. If one line is enough, return one line only.
-11) AduBot should sound clear, exact, and helpful, not essay-like.
-12) In audit mode, every major finding must include at least one source citation tag like [NAAC-2] or [MVSR-4].
-13) In audit mode, map findings to criterion and metric IDs whenever present (for example 2.3.1, 6.5.2). If unavailable, write "Metric ID not found in retrieved context".
-14) In audit mode, quantify evidence gaps whenever possible (counts, percentages, years, accepted vs rejected values).
-
-User query:
-{user_query}
-
-Detected response mode:
-{response_mode}
-
-Retrieved metadata snapshot:
-- NAAC: {naac_meta_summary}
-- College evidence: {mvsr_meta_summary}
-
-Retrieved metric snapshot:
-- NAAC metric IDs: {naac_metric_snapshot}
-- College evidence metric IDs: {mvsr_metric_snapshot}
-
-Conversation memory:
-{memory_block}
-
-Retrieved context:
-{context_block}
-
-Source extracts for citation (use these IDs in your answer):
-{source_extract_block}
-
-{output_instructions}
-"""
+    return _COMPLIANCE_PROMPT_TEMPLATE.format(
+        task_instructions=task_instructions,
+        user_query=user_query,
+        response_mode=response_mode,
+        naac_meta_summary=naac_meta_summary,
+        mvsr_meta_summary=mvsr_meta_summary,
+        naac_metric_snapshot=naac_metric_snapshot,
+        mvsr_metric_snapshot=mvsr_metric_snapshot,
+        memory_block=memory_block,
+        context_block=context_block,
+        source_extract_block=source_extract_block,
+        output_instructions=output_instructions,
+    )
 
 
 def parse_compliance_response(
@@ -153,18 +273,13 @@ def parse_compliance_response(
 ) -> Dict[str, Any]:
     """Parse the XML-like response produced by the LLM."""
 
-    def extract_section(text: str, tag: str) -> str:
-        start_tag = f"<{tag}>"
-        end_tag = f"</{tag}>"
-        start = text.find(start_tag)
-        end = text.find(end_tag)
-
-        if start != -1 and end != -1:
-            return text[start + len(start_tag) : end].strip()
-        return ""
+    # One pass collects every tagged section; the first occurrence of a tag wins
+    sections: Dict[str, str] = {}
+    for tag, content in _RESPONSE_SECTION_RE.findall(generated_text):
+        sections.setdefault(tag, content.strip())
 
-    comprehensive_audit = extract_section(generated_text, "comprehensive_audit")
-    status = extract_section(generated_text, "status")
+    comprehensive_audit = sections.get("comprehensive_audit", "")
+    status = sections.get("status", "")
 
     if not comprehensive_audit and generated_text.strip():
         comprehensive_audit = generated_text.replace("<status>", "").replace("</status>", "").replace(status, "").strip()
@@ -229,83 +344,19 @@ def _format_chunk_label(
 
 def _determine_response_mode(user_query: str) -> str:
     query = (user_query or "").strip().lower()
-    strong_audit_keywords = [
-        "audit",
-        "compliance analysis",
-        "compliance gap",
-        "gap",
-        "analyze",
-        "analysis",
-        "evaluate",
-        "compare",
-        "comparison",
-        "difference",
-        "differences",
-        "weak claim",
-        "weakness",
-        "weaknesses",
-        "remediation",
-        "recommendation",
-        "satisfied",
-        "dvv",
-        "scoring",
-        "score risk",
-        "eligibility",
-    ]
-    direct_prefixes = [
-        "what",
-        "which",
-        "who",
-        "when",
-        "where",
-        "why",
-        "how",
-        "is",
-        "are",
-        "does",
-        "do",
-        "can",
-        "did",
-        "tell me",
-        "give me",
-        "show me",
-        "list",
-        "provide",
-        "share",
-        "mention",
-    ]
-    statement_direct_prefixes = [
-        "number of",
-        "count of",
-        "total number",
-        "list of",
-        "name of",
-    ]
-    direct_phrases = [
-        "how many",
-        "number of",
-        "count of",
-        "total number",
-        "name of",
-        "list of",
-        "which courses",
-        "which program",
-        "what is the number",
-    ]
-
-    if any(keyword in query for keyword in strong_audit_keywords):
+    if any(keyword in query for keyword in _STRONG_AUDIT_KEYWORDS):
         return "audit"
 
-    if any(query.startswith(prefix) for prefix in direct_prefixes):
+    if query.startswith(_DIRECT_PREFIXES):
         return "direct_answer"
 
-    if any(query.startswith(prefix) for prefix in statement_direct_prefixes):
+    if query.startswith(_STATEMENT_DIRECT_PREFIXES):
         return "direct_answer"
 
-    if any(phrase in query for phrase in direct_phrases):
+    if any(phrase in query for phrase in _DIRECT_PHRASES):
         return "direct_answer"
 
-    if re.match(r"^(what|which|who|when|where|why|how|is|are|does|do|can|did)\b", query):
+    if _QUESTION_WORD_RE.match(query):
         return "direct_answer"
 
     if _looks_like_short_factual_statement(query):
@@ -319,53 +370,17 @@ def _determine_response_mode(user_query: str) -> str:
 
 def _looks_like_short_factual_statement(query: str) -> bool:
     """Detect compact factual prompts that should return short direct answers."""
-    words = [word for word in re.findall(r"[a-z0-9%]+", query) if word]
+    words = [word for word in _QUERY_WORD_RE.findall(query) if word]
     if not words:
         return False
 
     if len(words) > 16:
         return False
 
-    factual_markers = {
-        "number",
-        "count",
-        "total",
-        "list",
-        "name",
-        "courses",
-        "course",
-        "students",
-        "student",
-        "faculty",
-        "program",
-        "programs",
-        "year",
-        "years",
-        "percentage",
-        "percent",
-        "ratio",
-    }
-
-    audit_markers = {
-        "gap",
-        "audit",
-        "analysis",
-        "analyze",
-        "evaluate",
-        "compare",
-        "comparison",
-        "remediation",
-        "weakness",
-        "dvv",
-        "risk",
-        "eligibility",
-        "compliance",
-    }
-
-    if any(marker in query for marker in audit_markers):
+    if any(marker in query for marker in _AUDIT_MARKERS):
         return False
 
-    return any(marker in words for marker in factual_markers)
+    return any(marker in words for marker in _FACTUAL_MARKERS)
 
 
 def _build_task_instructions(response_mode: str) -> str:
@@ -429,7 +444,7 @@ Formatting rules inside <comprehensive_audit>:
 
 
 def _truncate_memory_content(text: str, max_length: int) -> str:
-    normalized = re.sub(r"\s+", " ", text or "").strip()
+    normalized = _WHITESPACE_RE.sub(" ", text or "").strip()
     if len(normalized) <= max_length:
         return normalized
     return normalized[: max_length - 3].rstrip() + "..."
@@ -515,7 +530,7 @@ def _build_extract_descriptor(metadata: Dict[str, Any]) -> str:
 
 
 def _truncate_extract(text: str, max_length: int = 260) -> str:
-    normalized = re.sub(r"\s+", " ", (text or "")).strip()
+    normalized = _WHITESPACE_RE.sub(" ", (text or "")).strip()
     if len(normalized) <= max_length:
         return normalized
     return normalized[: max_length - 3].rstrip() + "..."
@@ -543,8 +558,7 @@ def _collect_metric_ids(context_rows: List[str], metadata_rows: List[Dict[str, A
 
 
 def _extract_metric_ids(text: str) -> List[str]:
-    pattern = re.compile(r"\b[1-7]\.\d(?:\.\d)?\b")
-    return sorted(set(pattern.findall(text or "")), key=_metric_sort_key)
+    return sorted(set(_METRIC_ID_RE.findall(text or "")), key=_metric_sort_key)
 
 
 def _metric_sort_key(metric: str) -> tuple[int, int, int]:
@@ -10,10 +10,11 @@ from dataclasses import dataclass
 from typing import Any, Dict, List
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-import psycopg2
 from psycopg2.extras import Json, execute_batch
 from sentence_transformers import SentenceTransformer
 
+from ..db.pg_pool import DEFAULT_MAX_CONNECTIONS, pooled_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,11 +38,14 @@ class ConversationMemoryStore:
         long_ttl_days: int = 365,
         short_limit: int = 20,
         long_top_k: int = 6,
+        pool_max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ):
         if not db_url:
             raise ValueError("SUPABASE_DB_URL is required for conversation memory store")
 
         self.db_url = db_url
+        self.connection_url = self._build_connection_url(db_url)
+        self.pool_max_connections = pool_max_connections
         self.embedding_dim = embedding_dim
         self.short_ttl_days = max(short_ttl_days, 1)
         self.long_ttl_days = max(long_ttl_days, 1)
@@ -317,7 +321,7 @@ class ConversationMemoryStore:
         return {}
 
     def _get_connection(self):
-        return psycopg2.connect(self._build_connection_url(self.db_url))
+        return pooled_connection(self.connection_url, self.pool_max_connections)
 
     def _build_connection_url(self, db_url: str) -> str:
         parsed = urlparse(db_url)
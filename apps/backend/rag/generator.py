@@ -5,6 +5,7 @@ Handles response generation using retrieved context and Groq LLM
 
 from typing import Dict, Any, List, Optional, Tuple
 import logging
+import re
 from dataclasses import dataclass
 
 from ..debug.trace_logger import get_pipeline_trace_logger
@@ -300,7 +301,6 @@ class ComplianceGenerator:
         cleaned = ' '.join(text.split())
         
         # Remove page markers and other artifacts  
-        import re
         cleaned = re.sub(r'--- Page \d+ ---', '', cleaned)
         cleaned = re.sub(r'--- Table \d+ on Page \d+ ---', '', cleaned)
         
@@ -0,0 +1,203 @@
+"""
+Query Response Cache for NAAC Compliance Intelligence System
+Two-tier cache in front of RAGPipeline.process_query: an exact-match LRU on
+the normalized query text, backed by a semantic tier that returns a cached
+response when a new query embeds within a cosine-similarity threshold of a
+previously answered one.
+
+Entries are scoped by the request filters and expire after a TTL; the API
+clears the cache whenever new documents are ingested. A semantic hit also
+requires the same criterion, metric and other numbers in both queries, since
+embeddings barely separate "criterion 2.1" from "criterion 3.1".
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pipeline statuses that describe a failure rather than an answer.
+UNCACHEABLE_STATUSES = {"Processing Error"}
+
+# Criterion/metric identifiers, years and counts ("2", "2.1", "6.5.2", "2023")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)*")
+_WORD_RE = re.compile(r"[a-z]+")
+_NUMBER_WORDS = {
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    "six": "6",
+    "seven": "7",
+    "eight": "8",
+    "nine": "9",
+    "ten": "10",
+}
+
+
+@dataclass
+class _CacheEntry:
+    response: Dict[str, Any]
+    embedding: Optional[np.ndarray]
+    numbers: Tuple[str, ...]
+    expires_at: float
+
+
+class QueryResponseCache:
+    """Thread-safe exact + semantic cache of pipeline responses."""
+
+    def __init__(
+        self,
+        embed_query: Optional[Callable[[str], np.ndarray]] = None,
+        max_entries: int = 512,
+        ttl_seconds: int = 900,
+        similarity_threshold: float = 0.97,
+    ):
+        """
+        Args:
+            embed_query: Returns an embedding for a query; None disables the semantic tier
+            max_entries: Maximum cached responses before least-recently-used eviction
+            ttl_seconds: Lifetime of a cached response
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.embed_query = embed_query
+        self.max_entries = max(int(max_entries or 1), 1)
+        self.ttl_seconds = max(int(ttl_seconds or 1), 1)
+        self.similarity_threshold = float(similarity_threshold)
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._lock = Lock()
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return " ".join(str(query or "").lower().split())
+
+    @staticmethod
+    def _query_numbers(normalized_query: str) -> Tuple[str, ...]:
+        """Numbers a semantic hit must share with the cached query, spelled-out ones included."""
+        numbers = set(_NUMBER_RE.findall(normalized_query))
+        numbers.update(_NUMBER_WORDS[word] for word in _WORD_RE.findall(normalized_query) if word in _NUMBER_WORDS)
+        return tuple(sorted(numbers))
+
+    @staticmethod
+    def _filters_key(filters: Optional[Dict[str, Any]]) -> str:
+        return json.dumps(filters or {}, sort_keys=True, default=str)
+
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        if self.embed_query is None:
+            return None
+        try:
+            vector = np.asarray(self.embed_query(query), dtype=np.float32).ravel()
+        except Exception as e:
+            logger.warning(f"Query cache embedding failed; semantic tier skipped: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def get(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Look up a cached response for a query.
+
+        Returns:
+            (response or None, query embedding or None). Pass the embedding back
+            to put() on a miss so the query is not embedded twice.
+        """
+        key = (self._normalize_query(query), self._filters_key(filters))
+        numbers = self._query_numbers(key[0])
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["exact_hits"] += 1
+                return copy.deepcopy(entry.response), entry.embedding
+
+        # Embed outside the lock; the vector is reused by put() on a miss.
+        embedding = self._embed(query)
+        if embedding is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None, None
+
+        with self._lock:
+            candidates = [
+                (cached_key, cached)
+                for cached_key, cached in self._entries.items()
+                if cached_key[1] == key[1] and cached.numbers == numbers and cached.embedding is not None
+            ]
+            if candidates:
+                matrix = np.stack([cached.embedding for _, cached in candidates])
+                similarities = matrix @ embedding
+                best = int(np.argmax(similarities))
+                if float(similarities[best]) >= self.similarity_threshold:
+                    best_key, best_entry = candidates[best]
+                    self._entries.move_to_end(best_key)
+                    self._stats["semantic_hits"] += 1
+                    return copy.deepcopy(best_entry.response), embedding
+            self._stats["misses"] += 1
+
+        return None, embedding
+
+    def put(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]],
+        response: Dict[str, Any],
+        embedding: Optional[np.ndarray] = None,
+    ) -> None:
+        """Store a successful pipeline response."""
+        if response.get("status") in UNCACHEABLE_STATUSES:
+            return
+
+        key = (self._normalize_query(query), self._filters_key(filters))
+        entry = _CacheEntry(
+            response=copy.deepcopy(response),
+            embedding=embedding,
+            numbers=self._query_numbers(key[0]),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response, e.g. after the knowledge base changes."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity_threshold": self.similarity_threshold,
+                "semantic_enabled": self.embed_query is not None,
+                **self._stats,
+            }
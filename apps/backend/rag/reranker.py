@@ -11,6 +11,7 @@ Pipeline position:
 from __future__ import annotations
 
 import logging
+import math
 from dataclasses import dataclass, field
 from typing import List, Optional
 
@@ -244,7 +245,6 @@ class ComplianceReranker:
 
 def _sigmoid(x: float) -> float:
     """Sigmoid to map unbounded cross-encoder logit score into (0, 1)."""
-    import math
     try:
         return 1.0 / (1.0 + math.exp(-x))
     except OverflowError:
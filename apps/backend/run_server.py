@@ -16,21 +16,23 @@ if str(apps_dir) not in sys.path:
     sys.path.insert(0, str(apps_dir))
 
 # Now we can import the backend modules with proper paths
-from apps.backend.api.main import app
+from apps.backend.api.main import app, UVICORN_LOOP
 
 if __name__ == "__main__":
     import uvicorn
     
     # Get settings
     try:
-        from apps.backend.config.settings import settings
+        from apps.backend.config.settings import get_settings
+        settings = get_settings()
         uvicorn.run(
             app, 
             host=settings.host, 
             port=settings.port,
             reload=settings.reload,
-            log_level=settings.log_level.lower()
+            log_level=settings.log_level.lower(),
+            loop=UVICORN_LOOP,
         )
     except Exception as e:
         print(f"Failed to load settings, using defaults: {e}")
-        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+        uvicorn.run(app, host="0.0.0.0", port=8000, loop=UVICORN_LOOP)
\ No newline at end of file
@@ -0,0 +1,86 @@
+import pytest
+
+pytest.importorskip("chromadb")
+
+from apps.backend.db.chroma_store import ChromaVectorStore
+
+
+class _FakeCollection:
+    def __init__(self, failures=0, fail_after=0):
+        self.failures = failures
+        self.fail_after = fail_after
+        self.added = []
+        self.ids = []
+
+    def add(self, documents, embeddings, metadatas, ids):
+        if self.failures and len(self.added) >= self.fail_after:
+            self.failures -= 1
+            raise RuntimeError("disk full")
+        self.added.extend(documents)
+        self.ids.extend(ids)
+
+    def delete(self, ids):
+        kept = [(doc, row_id) for doc, row_id in zip(self.added, self.ids) if row_id not in set(ids)]
+        self.added = [doc for doc, _ in kept]
+        self.ids = [row_id for _, row_id in kept]
+
+
+class _FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+def _store(tmp_path, collection, write_batch_size=2):
+    store = ChromaVectorStore(persist_directory=str(tmp_path), write_batch_size=write_batch_size)
+    # Stand in for the lazily opened collection and model so neither is loaded
+    store.__dict__["naac_collection"] = collection
+    store.__dict__["embedding_function"] = _FakeEmbedder()
+    return store
+
+
+def _naac_metadata(count):
+    return [{"type": "requirement", "criterion": "2", "version": "2025"} for _ in range(count)]
+
+
+def test_rows_are_written_before_add_returns(tmp_path):
+    collection = _FakeCollection()
+    store = _store(tmp_path, collection)
+
+    store.add_naac_documents(["a", "b", "c"], _naac_metadata(3))
+
+    assert collection.added == ["a", "b", "c"]
+
+
+def test_failed_write_is_raised_and_not_carried_into_later_calls(tmp_path):
+    collection = _FakeCollection(failures=1)
+    store = _store(tmp_path, collection)
+
+    with pytest.raises(RuntimeError):
+        store.add_naac_documents(["a"], _naac_metadata(1))
+    store.add_naac_documents(["b"], _naac_metadata(1))
+
+    assert collection.added == ["b"]
+
+
+def test_partial_write_is_removed_on_failure(tmp_path):
+    collection = _FakeCollection(failures=1, fail_after=2)
+    store = _store(tmp_path, collection)
+
+    with pytest.raises(RuntimeError):
+        store.add_naac_documents(["a", "b", "c"], _naac_metadata(3))
+
+    assert collection.added == []
+
+
+def test_repeated_texts_are_embedded_once(tmp_path):
+    collection = _FakeCollection()
+    store = _store(tmp_path, collection)
+
+    store.add_naac_documents(["cover", "a", "cover"], _naac_metadata(3))
+
+    assert store.embedding_function.calls == [["cover", "a"]]
+    assert collection.added == ["cover", "a", "cover"]
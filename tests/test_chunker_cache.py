@@ -0,0 +1,32 @@
+from apps.backend.ingestion.chunker import DocumentChunker
+
+TEXT = "Criterion 2 Teaching-Learning and Evaluation\n\n" + ("Student enrolment and profile details. " * 40)
+
+
+def test_cache_key_separates_text_and_metadata():
+    chunker = DocumentChunker()
+
+    assert chunker._cache_key("ab", {"c": 1}) != chunker._cache_key("a", {"c": 1})
+    assert chunker._cache_key("a", {"c": 1}) != chunker._cache_key("a", {"c": 2})
+    assert chunker._cache_key('a{"c": 1}', {}) != chunker._cache_key("a", {"c": 1})
+
+
+def test_same_text_with_other_metadata_is_chunked_afresh():
+    chunker = DocumentChunker()
+
+    first = chunker.chunk_document(TEXT, {"source_file": "a.pdf"})
+    second = chunker.chunk_document(TEXT, {"source_file": "b.pdf"})
+
+    assert {chunk.metadata["source_file"] for chunk in first} == {"a.pdf"}
+    assert {chunk.metadata["source_file"] for chunk in second} == {"b.pdf"}
+
+
+def test_cache_hit_returns_independent_metadata():
+    chunker = DocumentChunker()
+    first = chunker.chunk_document(TEXT, {"source_file": "a.pdf"})
+    first[0].metadata["source_file"] = "edited.pdf"
+
+    again = chunker.chunk_document(TEXT, {"source_file": "a.pdf"})
+
+    assert [chunk.text for chunk in again] == [chunk.text for chunk in first]
+    assert again[0].metadata["source_file"] == "a.pdf"
@@ -0,0 +1,46 @@
+import numpy as np
+
+from apps.backend.db.embedding_cache import EmbeddingCache, encode_unique
+
+
+class _CountingEncoder:
+    def __init__(self, offset: float = 0.0):
+        self.offset = offset
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text) + self.offset, 1.0] for text in texts], dtype=np.float32)
+
+
+def test_cached_texts_are_not_encoded_again(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.db"), namespace="model-a")
+    encoder = _CountingEncoder()
+
+    first = cache.encode(["alpha", "beta", "alpha"], encoder)
+    second = cache.encode(["beta", "gamma"], encoder)
+
+    assert encoder.calls == [["alpha", "beta"], ["gamma"]]
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second[0], first[1])
+
+
+def test_namespaces_do_not_share_embeddings(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    EmbeddingCache(db_path, namespace="model-a").encode(["alpha"], _CountingEncoder())
+    other_model = _CountingEncoder(offset=100.0)
+
+    vectors = EmbeddingCache(db_path, namespace="model-b").encode(["alpha"], other_model)
+
+    assert other_model.calls == [["alpha"]]
+    assert vectors[0][0] == 105.0
+
+
+def test_encode_unique_reuses_vectors_for_repeated_texts():
+    encoder = _CountingEncoder()
+
+    vectors = encode_unique(["header", "body", "header"], encoder)
+
+    assert encoder.calls == [["header", "body"]]
+    np.testing.assert_array_equal(vectors[0], vectors[2])
+    assert vectors.shape == (3, 2)
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("orjson")
+
+from apps.backend.ingestion.ingestion_log import IngestionLog
+
+
+def _entry(file_hash, document_type="naac_requirement", **fields):
+    return {
+        "file_hash": file_hash,
+        "document_type": document_type,
+        "file_path": f"/data/{file_hash}.pdf",
+        "file_name": f"{file_hash}.pdf",
+        "chunk_count": 3,
+        "timestamp": "2024-01-01T00:00:00",
+        **fields,
+    }
+
+
+def test_records_round_trip_in_memory():
+    log = IngestionLog()
+    log.record(_entry("a"))
+    log.record(_entry("a", timestamp="2024-02-01T00:00:00"))
+    log.record(_entry("a", document_type="mvsr_evidence"))
+    log.record(_entry("b"))
+
+    assert log.contains("a", "naac_requirement")
+    assert log.contains("a", "mvsr_evidence")
+    assert not log.contains("c", "naac_requirement")
+    assert log.counts_by_type() == {"naac_requirement": 2, "mvsr_evidence": 1}
+    assert log.last_timestamp() == "2024-02-01T00:00:00"
+
+    log.clear()
+
+    assert not log.contains("a", "naac_requirement")
+    assert log.counts_by_type() == {}
+    assert log.last_timestamp() is None
+
+
+def test_history_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "ingestion_log.db")
+    IngestionLog(db_path).record(_entry("a"))
+
+    assert IngestionLog(db_path).contains("a", "naac_requirement")
+
+
+def test_contains_path_requires_matching_size_and_mtime():
+    log = IngestionLog()
+    log.record(_entry("a", file_size=100, mtime_ns=5))
+
+    assert log.contains_path("/data/a.pdf", "naac_requirement", 100, 5)
+    assert not log.contains_path("/data/a.pdf", "naac_requirement", 101, 5)
+    assert not log.contains_path("/data/a.pdf", "naac_requirement", 100, 6)
+    assert not log.contains_path("/data/a.pdf", "mvsr_evidence", 100, 5)
+    assert not log.contains_path("/data/b.pdf", "naac_requirement", 100, 5)
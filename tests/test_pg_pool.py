@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+import psycopg2.extensions
+
+from apps.backend.db import pg_pool
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if self.conn.dropped:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+
+class _FakeConnection:
+    def __init__(self, dropped=False):
+        self.closed = 0
+        self.dropped = dropped
+        self.info = SimpleNamespace(transaction_status=psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class _FakePool:
+    def __init__(self, idle):
+        self.idle = list(idle)
+        self.returned = []
+
+    def getconn(self):
+        return self.idle.pop(0) if self.idle else _FakeConnection()
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    def install(*idle):
+        pool = _FakePool(idle)
+        monkeypatch.setattr(pg_pool, "_get_pool", lambda url, max_connections: pool)
+        monkeypatch.setattr(pg_pool, "_last_used", {})
+        return pool
+
+    return install
+
+
+def test_connection_is_discarded_after_operational_error(fake_pool):
+    pool = fake_pool()
+
+    with pytest.raises(psycopg2.OperationalError):
+        with pg_pool.pooled_connection("postgresql://example"):
+            raise psycopg2.OperationalError("connection reset")
+
+    assert [close for _, close in pool.returned] == [True]
+
+
+def test_stale_idle_connection_is_replaced_before_use(fake_pool):
+    stale = _FakeConnection(dropped=True)
+    pool = fake_pool(stale)
+    pg_pool._last_used[id(stale)] = 0.0
+
+    with pg_pool.pooled_connection("postgresql://example") as conn:
+        assert conn is not stale
+
+    assert pool.returned == [(stale, True), (conn, False)]
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def connect(*args, **kwargs):
+        opened.append(_FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(psycopg2, "connect", connect)
+    monkeypatch.setattr(pg_pool, "_pools", {})
+    monkeypatch.setattr(pg_pool, "_last_used", {})
+    return opened
+
+
+def test_returned_connections_are_reused(connections):
+    with pg_pool.pooled_connection("postgresql://example", max_connections=2) as first:
+        with pg_pool.pooled_connection("postgresql://example", max_connections=2) as second:
+            pass
+
+    for _ in range(3):
+        with pg_pool.pooled_connection("postgresql://example", max_connections=2) as conn:
+            assert conn in (first, second)
+
+    assert connections == [first, second]
+    assert not first.closed and not second.closed
+
+
+def test_closed_connections_are_forgotten(connections):
+    with pytest.raises(psycopg2.OperationalError):
+        with pg_pool.pooled_connection("postgresql://example") as conn:
+            raise psycopg2.OperationalError("connection reset")
+
+    assert conn.closed
+    assert pg_pool._last_used == {}
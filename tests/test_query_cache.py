@@ -0,0 +1,52 @@
+import numpy as np
+
+from apps.backend.rag.query_cache import QueryResponseCache
+
+
+def _embed(query: str) -> np.ndarray:
+    vector = np.zeros(3, dtype=np.float32)
+    vector[0 if "criterion" in query.lower() else 1] = 1.0
+    return vector
+
+
+def test_exact_hit_ignores_case_and_whitespace():
+    cache = QueryResponseCache()
+    cache.put("What is Criterion 3?", None, {"status": "Fully Supported"})
+
+    response, _ = cache.get("  what is   criterion 3? ", None)
+
+    assert response == {"status": "Fully Supported"}
+
+
+def test_semantic_hit_is_scoped_by_filters():
+    cache = QueryResponseCache(embed_query=_embed)
+    _, embedding = cache.get("Explain criterion 2", {"criterion": "2"})
+    cache.put("Explain criterion 2", {"criterion": "2"}, {"status": "Gap Identified"}, embedding)
+
+    hit, _ = cache.get("Describe criterion two", {"criterion": "2"})
+    miss, _ = cache.get("Describe criterion two", {"criterion": "3"})
+
+    assert hit == {"status": "Gap Identified"}
+    assert miss is None
+
+
+def test_error_responses_are_not_cached():
+    cache = QueryResponseCache()
+    cache.put("q", None, {"status": "Processing Error"})
+
+    response, _ = cache.get("q", None)
+
+    assert response is None
+
+
+def test_semantic_hit_requires_matching_criterion_numbers():
+    # Every query embeds identically, as near-identical MiniLM queries almost do
+    cache = QueryResponseCache(embed_query=lambda query: np.ones(3, dtype=np.float32))
+    _, embedding = cache.get("What does criterion 2.1 require?", None)
+    cache.put("What does criterion 2.1 require?", None, {"status": "Fully Supported"}, embedding)
+
+    other_metric, _ = cache.get("What does criterion 3.1 require?", None)
+    same_metric, _ = cache.get("what is required by criterion 2.1", None)
+
+    assert other_metric is None
+    assert same_metric == {"status": "Fully Supported"}